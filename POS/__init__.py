@@ -1,15 +1,14 @@
 import logging
 import os
 import shutil
-from logging.handlers import RotatingFileHandler
 
-import redis
 from apscheduler.schedulers.background import BackgroundScheduler
 from flask import Flask, send_from_directory, redirect, url_for, render_template
 from flask_jsglue import JSGlue
 from flask_login import LoginManager
-from flask_session import Session, RedisSessionInterface
+from flask_session import Session
 from raven.contrib.flask import Sentry
+from werkzeug.contrib.fixers import ProxyFix
 from werkzeug.exceptions import BadRequest, InternalServerError, NotFound
 
 from POS.blueprints.billing.controllers import billing_bp
@@ -31,11 +30,21 @@ from POS.blueprints.user.signup.controllers import signup_bp
 from POS.blueprints.sales.controllers import checkout_bp
 from POS.blueprints.sales.controllers import sales_bp
 from POS.blueprints.reports.controllers import manage_reports_bp
-
+from POS.blueprints.metrics.controllers import metrics_bp
+from POS.blueprints.profiling.controllers import profiling_bp
+
+from POS.app_logging import AppLogging
+from POS.instrumentation import RequestInstrumentation
+from POS.metrics import AppMetrics
+from POS.migrations import AppMigrations
+from POS.profiling import RequestProfiler
+from POS.slow_query_log import SlowQueryLog
 from POS.models.base_model import AppDB
-from POS.models.user_management.user import User
+from POS.models.redis_store import AppRedis
+from POS.models.user_management.user import UserPrincipal
+from POS.sessions import CompactRedisSessionInterface
 from .constants import DEV_CONFIG_VAR, PROD_CONFIG_VAR, \
-    TESTING_CONFIG_VAR, APP_NAME, OWNER_ROLE_NAME, ADMIN_ROLE_NAME, CASHIER_ROLE_NAME, REDIS_URL_ENV_VAR, LOCAL_REDIS_URL
+    TESTING_CONFIG_VAR, APP_NAME, OWNER_ROLE_NAME, ADMIN_ROLE_NAME, CASHIER_ROLE_NAME, SESSION_KEY_PREFIX
 from .utils import get_config_type
 
 
@@ -70,6 +79,10 @@ def config_app(app_instance):
     # Ensure flask doesn't redirect to trailing slash endpoint
     app_instance.url_map.strict_slashes = False
 
+    # Take the client address from X-Forwarded-For set by the proxies in front of the app
+    if app_instance.config["PROXY_COUNT"]:
+        app_instance.wsgi_app = ProxyFix(app_instance.wsgi_app, num_proxies=app_instance.config["PROXY_COUNT"])
+
 
 def set_up_logging(app_instance):
     """
@@ -81,17 +94,11 @@ def set_up_logging(app_instance):
 
 def file_logging(app_instance):
     """
-        Log WARNING level events in the app log file
+        Log events as JSON lines in the app log file (LOG_FILE), written by a background thread
     :param app_instance: flask app instance
     :return:
     """
-    app_instance.logger.setLevel(logging.DEBUG)
-
-    handler = RotatingFileHandler(APP_NAME + ".log")
-    handler.setLevel(logging.DEBUG)
-    handler.setFormatter(logging.Formatter("[%(asctime)s][%(levelname)s]: %(message)s"))
-
-    app_instance.logger.addHandler(handler)
+    AppLogging.init_app(app_instance)
 
 
 def sentry_logging(app_instance):
@@ -116,8 +123,8 @@ def clear_all_sessions():
     if os.path.exists(path_to_folder):
         shutil.rmtree(path_to_folder)
 
-    redis_db = redis.from_url(os.environ.get(REDIS_URL_ENV_VAR, LOCAL_REDIS_URL))
-    for key in redis_db.scan_iter("session:*"):
+    redis_db = AppRedis.get_client()
+    for key in redis_db.scan_iter(SESSION_KEY_PREFIX + "*"):
         redis_db.delete(key)
 
 
@@ -145,10 +152,6 @@ app = Flask(__name__)
 
 init_app(app)
 
-# Specify session storage mechanism
-redis_db = redis.from_url(os.environ.get(REDIS_URL_ENV_VAR, LOCAL_REDIS_URL))
-app.session_interface = RedisSessionInterface(redis_db, "session:")
-
 # Initialize the DB
 with app.app_context():
     AppDB.init_db()
@@ -157,14 +160,24 @@ with app.app_context():
 with app.app_context():
     AppDB.init_db()
 
+# Measure the SQL, Redis and wall time of every request
+RequestInstrumentation.init_app(app, AppDB.db_engine)
+
+# Database migration commands (see `flask db --help`)
+AppMigrations.init_app(app)
+
+# Log slow SQL statements (see `flask slow-queries`)
+SlowQueryLog.init_app(app, AppDB.db_engine)
+
 # Create login manager
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = "login_bp.login"
 
-# Create session manager
+# Create session manager (stores sessions in Redis through the shared AppRedis pool, see SESSION_REDIS)
 ses = Session()
 ses.init_app(app)
+CompactRedisSessionInterface.init_app(app)
 
 # Associate with JSGlue
 js_glue = JSGlue()
@@ -173,7 +186,10 @@ js_glue.init_app(app)
 
 @login_manager.user_loader
 def load_user(user_id):
-    return AppDB.db_session.query(User).get(user_id)
+    try:
+        return UserPrincipal.load(int(user_id))
+    except ValueError:
+        return None
 
 
 @login_manager.unauthorized_handler
@@ -248,3 +264,13 @@ app_blueprints = (
 )
 
 register_blueprints(app_blueprints)
+
+# Serve Prometheus metrics
+if app.config["METRICS_ENABLED"]:
+    AppMetrics.init_app(app, AppDB.db_engine)
+    register_blueprints((metrics_bp,))
+
+# Profile requests on demand (see POS.profiling)
+if app.config["PROFILING_ENABLED"]:
+    RequestProfiler.init_app(app)
+    register_blueprints((profiling_bp,))
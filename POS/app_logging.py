@@ -0,0 +1,149 @@
+"""
+    This module sets up the app logging. Request threads only put log records on a queue,
+    a listener thread formats them as JSON lines and writes them to a log file rotated by size and time
+"""
+
+import atexit
+import datetime
+import json
+import logging
+import os
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+
+from flask import current_app
+
+
+class JsonFormatter(logging.Formatter):
+    """
+        Formats each record as one JSON object per line
+    """
+    def format(self, record):
+        log_entry = dict(
+            time=datetime.datetime.utcfromtimestamp(record.created).isoformat() + "Z",
+            level=record.levelname,
+            logger=record.name,
+            message=record.getMessage(),
+            module=record.module,
+            line=record.lineno,
+            thread=record.threadName,
+            process=record.process
+        )
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            log_entry["exception"] = record.exc_text
+
+        return json.dumps(log_entry, default=str)
+
+
+class LogQueueHandler(QueueHandler):
+    """
+        Queues records with their message and traceback already rendered (the listener thread must not
+        depend on objects the request thread may change), leaving the formatting to the listener
+    """
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+
+        return record
+
+
+class SizedTimedRotatingFileHandler(TimedRotatingFileHandler):
+    """
+        Rotates the log file at the configured time interval or once it reaches max_bytes, whichever comes first
+    """
+    def __init__(self, filename, max_bytes=0, **kwargs):
+        super(SizedTimedRotatingFileHandler, self).__init__(filename, **kwargs)
+        self.max_bytes = max_bytes
+
+    def shouldRollover(self, record):
+        if super(SizedTimedRotatingFileHandler, self).shouldRollover(record):
+            return 1
+
+        if self.max_bytes > 0:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.seek(0, 2)
+            if self.stream.tell() + len(self.format(record)) + 1 >= self.max_bytes:
+                return 1
+        return 0
+
+    def rotation_filename(self, default_name):
+        # Size rollovers can happen several times within an interval, never overwrite an earlier file
+        rotated_name = default_name
+        index = 0
+        while os.path.exists(rotated_name):
+            index += 1
+            rotated_name = "%s.%d" % (default_name, index)
+        return super(SizedTimedRotatingFileHandler, self).rotation_filename(rotated_name)
+
+
+class AppLogging(object):
+    listener = None
+
+    @staticmethod
+    def init_app(app_instance):
+        """
+            Routes the logs of the app (and of the libraries it uses) through a queue to the log file,
+            with the levels of the loggers taken from LOG_LEVELS
+        :param app_instance: Flask app instance
+        :return:
+        """
+        config = app_instance.config
+
+        handlers = []
+        if config["LOG_FILE"]:
+            file_handler = SizedTimedRotatingFileHandler(
+                config["LOG_FILE"],
+                max_bytes=config["LOG_MAX_BYTES"],
+                when=config["LOG_ROTATE_WHEN"],
+                backupCount=config["LOG_BACKUP_COUNT"],
+                delay=True
+            )
+            file_handler.setFormatter(JsonFormatter())
+            handlers.append(file_handler)
+
+        if app_instance.debug:
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(logging.Formatter("[%(asctime)s][%(levelname)s][%(name)s]: %(message)s"))
+            handlers.append(console_handler)
+
+        log_queue = queue.Queue(-1)
+        AppLogging.listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        AppLogging.listener.start()
+        # Write out the records still queued when the process exits
+        atexit.register(AppLogging.stop)
+
+        # Attached to the root logger, so Flask does not add its default (synchronous) handler to app.logger
+        root_logger = logging.getLogger()
+        root_logger.addHandler(LogQueueHandler(log_queue))
+
+        for logger_name, level in config["LOG_LEVELS"].items():
+            logging.getLogger(logger_name).setLevel(level)
+
+    @staticmethod
+    def stop():
+        if AppLogging.listener is not None:
+            AppLogging.listener.stop()
+            AppLogging.listener = None
+
+
+def sampled_debug(msg, *args):
+    """
+        Logs a debug message for a DEBUG_LOG_SAMPLE_RATE fraction of the calls, so that hot paths
+        can keep their diagnostics without paying for them on every request.
+        The arguments are only formatted when the message is logged
+    :param msg: Message format string
+    :param args: Message arguments
+    :return:
+    """
+    logger = current_app.logger
+    if logger.isEnabledFor(logging.DEBUG) and random.random() < current_app.config["DEBUG_LOG_SAMPLE_RATE"]:
+        logger.debug(msg, *args)
@@ -34,6 +34,21 @@ class AppView(MethodView):
             status=400
         )
 
+    @staticmethod
+    def service_busy_response():
+        """
+            Tells the client to retry shortly, with a real 503 status so that proxies and clients do
+        :return:
+        """
+        response = make_response(
+            jsonify(dict(msg="We are experiencing high traffic, kindly try again")),
+            503
+        )
+        response.headers["code"] = 503
+        response.headers["Retry-After"] = 1
+
+        return response
+
     @staticmethod
     def error_in_processing_request():
         return AppView.send_response(
@@ -2,12 +2,14 @@ from flask import request, make_response, Blueprint, current_app, render_templat
 from sqlalchemy.exc import SQLAlchemyError
 
 from POS import constants
+from POS.app_logging import sampled_debug
 from POS.models.base_model import AppDB
 from POS.blueprints.base.app_view import AppView
+from POS.metrics import AppMetrics
 from POS.models.user_management.business import Business
 from POS.models.billing.billing_transaction import BillingTransaction
 from POS.models.billing.ewallet import EWallet
-from POS.utils import is_owner, business_is_active
+from POS.utils import is_owner, business_is_active, rate_limited
 
 
 class BillingAPI(AppView):
@@ -24,7 +26,7 @@ class BillingAPI(AppView):
                 account_id=business_ewallet[1].account_id,
                 balance=business_ewallet[1].balance)
 
-        print(business_billing_info)
+        sampled_debug("Billing info: %s", business_billing_info)
 
         return render_template(
             template_name_or_list="business_billing_info.html",
@@ -32,6 +34,7 @@ class BillingAPI(AppView):
         )
 
     @staticmethod
+    @rate_limited("billing", request_fields=("clientAccount",), per_ip=False)
     def post():
         # AT payments callback contacted
         billing_request = request.get_json(force=True)
@@ -44,11 +47,13 @@ class BillingAPI(AppView):
             return BillingAPI.validation_error_response()
 
         if billing_request:
-            print("Payment Request Details of type({1}): ({0}) ".format(len(billing_request), type(billing_request)))
-            print("Provider: {0}".format(billing_request["provider"]))
-            print("Client Account: {0}".format(billing_request["clientAccount"]))
-            print("Product name: {0}".format(billing_request["productName"]))
-            print("Value: {0}".format(billing_request["value"]))
+            sampled_debug(
+                "Payment request: provider(%s), client account(%s), product name(%s), value(%s)",
+                billing_request["provider"],
+                billing_request["clientAccount"],
+                billing_request["productName"],
+                billing_request["value"]
+            )
 
             value = float(billing_request["value"][3:])
             client_account = int(billing_request["clientAccount"])
@@ -90,6 +95,7 @@ class BillingAPI(AppView):
         return False
 
     @staticmethod
+    @AppMetrics.billing_run_seconds.time()
     def bill_user(business_id):
         try:
             # Get the current business EWallet account
@@ -111,6 +117,8 @@ class BillingAPI(AppView):
                 AppDB.db_session.add(billing_transaction)
                 AppDB.db_session.commit()
 
+                AppMetrics.businesses_billed.inc()
+
             # Logout user if credit minimum reached
             # redis_db = redis.from_url(
             #     os.environ.get(constants.REDIS_URL_ENV_VAR, constants.LOCAL_REDIS_URL))
@@ -99,7 +99,7 @@ class BusinessAPI(AppView):
             # but relative to the business
             user_business = UserBusiness(owner_role_id)
             user_business.business = business
-            user_business.user = current_user
+            user_business.emp_id = current_user.emp_id
 
             # Add business info to database
             AppDB.db_session.add(business)
@@ -5,7 +5,7 @@ from sqlalchemy.exc import SQLAlchemyError
 
 from POS.blueprints.base.app_view import AppView
 from POS.models.base_model import AppDB
-from POS.models.user_management.user import User
+from POS.models.user_management.user import User, UserPrincipal
 from POS.models.user_management.business import Business
 from POS.models.user_management.role import Role
 from POS.models.user_management.user_business import UserBusiness
@@ -124,13 +124,13 @@ class UserRoleAPI(AppView):
                 role_name = role["role"].strip().lower()
                 role_id = Role.get_role_id(role_name)
                 if not role_id:
-                    print("No role with that name")
+                    current_app.logger.info("No role named %s", role_name)
                     continue
 
                 # Confirm that as an admin, you can perform this role change
                 if session["role"] == ADMIN_ROLE_NAME and role_name == OWNER_ROLE_NAME:
                     # An admin cannot change the role to owner
-                    print("You don't have privilege to change anything about an owner")
+                    current_app.logger.info("Admin %s cannot assign the owner role", current_user.emp_id)
                     continue
 
                 # Confirm existence of employee
@@ -139,7 +139,7 @@ class UserRoleAPI(AppView):
                     User.emp_id == emp_id
                 ).first()
                 if not user:
-                    print("No user by that description")
+                    current_app.logger.info("No user with emp_id %s", emp_id)
                     continue
 
                 # User and role exist, go ahead and find the record
@@ -150,21 +150,21 @@ class UserRoleAPI(AppView):
 
                 # Confirm that an admin is not altering an owner
                 if session["role"] == ADMIN_ROLE_NAME and user_business.role_id == Role.get_role_id(OWNER_ROLE_NAME):
-                    print("You cannot alter an owner's details")
+                    current_app.logger.info("Admin %s cannot alter owner %s", current_user.emp_id, emp_id)
                     continue
 
                 if not user_business:
-                    print("That user does not work for you")
+                    current_app.logger.info("User %s does not work for business %s", emp_id, session.get("business_id"))
                     continue
 
                 # Prevent owner from deactivating or demoting himself
                 if current_user.emp_id == user_business.emp_id and \
                         user_business.role_id == Role.get_role_id(OWNER_ROLE_NAME):
-                    print("Cannot demote or deactivate yourself(%s, %s | Owner of(%s))" % (
-                        current_user.name,
-                        current_user.email,
-                        session["business_name"]
-                    ))
+                    current_app.logger.info(
+                        "Owner %s cannot demote or deactivate themselves in business %s",
+                        current_user.emp_id,
+                        session.get("business_id")
+                    )
                     continue
 
                 # Change the user's role in the business
@@ -174,6 +174,9 @@ class UserRoleAPI(AppView):
                 user_business.is_deactivated = role["deactivated"]
 
                 AppDB.db_session.commit()
+
+                # Make the user's next request reload their principal
+                UserPrincipal.invalidate(user_business.emp_id)
             except SQLAlchemyError as e:
                 AppDB.db_session.rollback()
                 current_app.logger.error(e)
@@ -263,6 +266,9 @@ class UserRoleAPI(AppView):
             AppDB.db_session.add(user_business)
             AppDB.db_session.commit()
 
+            # Make the user's next request reload their principal
+            UserPrincipal.invalidate(user.emp_id)
+
             return ManageAccountsAPI.send_response(
                 msg=dict(
                         accounts=ManageAccountsAPI.get_all_accounts(),
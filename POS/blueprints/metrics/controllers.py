@@ -0,0 +1,43 @@
+import hmac
+
+from flask import Blueprint, make_response, request, current_app
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+
+from POS.blueprints.base.app_view import AppView
+from POS.metrics import AppMetrics
+
+
+class MetricsAPI(AppView):
+    @staticmethod
+    def get():
+        """
+            Serves the app metrics in the Prometheus text format.
+            When METRICS_AUTH_TOKEN is set, scrapers must send it as a bearer token
+        :return:
+        """
+        auth_token = current_app.config.get("METRICS_AUTH_TOKEN")
+        if auth_token and not hmac.compare_digest(
+                request.headers.get("Authorization", ""),
+                "Bearer %s" % auth_token
+        ):
+            return make_response("Forbidden", 403)
+
+        response = make_response(generate_latest(
+            AppMetrics.registry(current_app.config["RATE_LIMITS"].keys())
+        ))
+        response.headers["Content-Type"] = CONTENT_TYPE_LATEST
+
+        return response
+
+
+# Create metrics view
+metrics_view = MetricsAPI.as_view("metrics")
+
+# Create metrics blueprint
+metrics_bp = Blueprint(
+    name="metrics_bp",
+    import_name=__name__,
+    url_prefix="/metrics"
+)
+
+metrics_bp.add_url_rule(rule="", view_func=metrics_view, methods=["GET"])
@@ -2,6 +2,7 @@ from flask import Blueprint, request, session, current_app, render_template
 from flask_login import login_required
 from sqlalchemy.exc import SQLAlchemyError
 
+from POS.app_logging import sampled_debug
 from POS.blueprints.base.app_view import AppView
 from POS.blueprints.category.controllers import CategoriesAPI
 from POS.models.base_model import AppDB
@@ -67,7 +68,7 @@ class ProductsAPI(AppView):
                 status=400
             )
 
-        print(modify_products_request)
+        sampled_debug("Modify products request: %s", modify_products_request)
 
         if not ProductsAPI.validate_modify_product_request(modify_products_request):
             return ProductsAPI.send_response(
@@ -176,17 +177,21 @@ class ProductsAPI(AppView):
 
     @staticmethod
     def get_all_products():
+        # The category names are joined in, rather than queried for every product
         products = [dict(
             num=num + 1,
             id=product.id,
             name=product.name,
             quantity=product.quantity,
-            category=Category.get_category_name(product.category_id),
+            category=category_name,
             buying_price=product.buying_price,
             selling_price=product.selling_price,
             reorder_level=product.reorder_level,
             description=product.description
-        ) for num, product in enumerate(AppDB.db_session.query(Product).filter(
+        ) for num, (product, category_name) in enumerate(AppDB.db_session.query(
+            Product,
+            Category.name
+        ).outerjoin(Product.category).filter(
             Product.business_id == session["business_id"]
         ).order_by(Product.id).all())]
 
@@ -270,7 +275,6 @@ class ProductAPI(AppView):
         except SQLAlchemyError as e:
             AppDB.db_session.rollback()
             current_app.logger.error(e)
-            print("App Configs: %s" % current_app.config)
             if "sentry" in current_app.config:
                 current_app.sentry.captureException()
             return ProductsAPI.error_in_processing_request()
@@ -0,0 +1,116 @@
+import os
+
+from flask import Blueprint, make_response, request, current_app
+from flask_login import login_required
+
+from POS.blueprints.base.app_view import AppView
+from POS.profiling import RequestProfiler, SamplingProfiler
+from POS.utils import is_admin
+
+
+class RequestProfileAPI(AppView):
+    @staticmethod
+    @login_required
+    @is_admin
+    def get(profile_id):
+        """
+            Gets the stats of a profiled request, as a text report or
+            as a pstats file (?format=pstats) for tools like snakeviz
+        :param profile_id: Id returned in the X-Profile-Id header of the profiled request
+        :return:
+        """
+        profile_data = RequestProfiler.load(profile_id)
+
+        if profile_data is None:
+            return RequestProfileAPI.send_response(
+                msg="Profile not found, it may have expired",
+                status=404
+            )
+
+        if request.args.get("format") == "pstats":
+            response = make_response(profile_data)
+            response.headers["Content-Type"] = "application/octet-stream"
+            response.headers["Content-Disposition"] = "attachment; filename=%s.prof" % profile_id
+            return response
+
+        response = make_response(RequestProfiler.format(
+            profile_data,
+            sort_by=request.args.get("sort", "cumulative"),
+            limit=request.args.get("limit", 50, type=int)
+        ))
+        response.headers["Content-Type"] = "text/plain; charset=utf-8"
+        return response
+
+
+class ProfileSampleAPI(AppView):
+    @staticmethod
+    @login_required
+    @is_admin
+    def post():
+        """
+            Starts sampling the stacks of the worker serving this request for ?seconds=N
+            (capped at PROFILING_MAX_SAMPLE_SECONDS)
+        :return:
+        """
+        config = current_app.config
+        seconds = min(
+            request.args.get("seconds", 10, type=float),
+            config["PROFILING_MAX_SAMPLE_SECONDS"]
+        )
+
+        sample_id = SamplingProfiler.start(
+            seconds=seconds,
+            interval=config["PROFILING_SAMPLE_INTERVAL_MS"] / 1000,
+            ttl=config["PROFILE_TTL_SECONDS"]
+        )
+
+        if sample_id is None:
+            return ProfileSampleAPI.send_response(
+                msg="This worker is already being sampled",
+                status=409
+            )
+
+        return ProfileSampleAPI.send_response(
+            msg="Sampling started",
+            status=202,
+            sample_id=sample_id,
+            seconds=seconds,
+            pid=os.getpid()
+        )
+
+    @staticmethod
+    @login_required
+    @is_admin
+    def get(sample_id):
+        """
+            Gets the collapsed stacks of a finished sampling run as text
+        :param sample_id: Id returned when the sampling was started
+        :return:
+        """
+        collapsed_stacks = SamplingProfiler.load(sample_id)
+
+        if collapsed_stacks is None:
+            return ProfileSampleAPI.send_response(
+                msg="Samples not found, sampling may still be running or the samples expired",
+                status=404
+            )
+
+        response = make_response(collapsed_stacks)
+        response.headers["Content-Type"] = "text/plain; charset=utf-8"
+        return response
+
+
+# Create profiling views
+request_profile_view = RequestProfileAPI.as_view("request_profile")
+profile_sample_view = ProfileSampleAPI.as_view("profile_sample")
+
+# Create profiling blueprint
+profiling_bp = Blueprint(
+    name="profiling_bp",
+    import_name=__name__,
+    url_prefix="/profiling"
+)
+
+profiling_bp.add_url_rule(rule="/requests/<profile_id>", view_func=request_profile_view, methods=["GET"])
+profiling_bp.add_url_rule(rule="/samples", view_func=profile_sample_view, methods=["POST"])
+profiling_bp.add_url_rule(rule="/samples/<sample_id>", view_func=profile_sample_view, methods=["GET"])
@@ -1,6 +1,7 @@
 from flask import Blueprint, render_template, make_response, request, current_app, session
 from flask_login import login_required
 from io import BytesIO
+import time
 
 
 import numpy as np
@@ -11,6 +12,7 @@ from matplotlib.figure import Figure
 
 from POS.blueprints.base.app_view import AppView
 from POS.blueprints.category.controllers import CategoriesAPI
+from POS.metrics import AppMetrics
 from POS.models.stock_management.category import Category
 from POS.models.stock_management.product import Product
 from POS.models.user_management.business import Business
@@ -56,6 +58,7 @@ class ProductBrandReportAPI(AppView):
         product_brand_quantity = [product.quantity for product in products]
 
         # Draw the bar graph to make comparision, this should simply tell the user the quantity of the products in-stock
+        render_start = time.perf_counter()
         fig = Figure()
         ax = fig.add_subplot(111)
 
@@ -79,6 +82,7 @@ class ProductBrandReportAPI(AppView):
         canvas = FigureCanvas(fig)
         png_output = BytesIO()
         canvas.print_png(png_output)
+        AppMetrics.report_render_seconds.labels("product_brand").observe(time.perf_counter() - render_start)
         response = make_response(png_output.getvalue())
         response.headers['Content-Type'] = 'image/png'
         return response
@@ -107,6 +111,7 @@ class ReorderLevelReportAPI(AppView):
         product_brand_re_order = [product.reorder_level for product in products]
 
         # draw the bar graph to make comparision, this should simply tell the user the quantity of the products in-stock
+        render_start = time.perf_counter()
         fig = Figure()
         ax = fig.add_subplot(111)
 
@@ -136,6 +141,7 @@ class ReorderLevelReportAPI(AppView):
         canvas = FigureCanvas(fig)
         png_output = BytesIO()
         canvas.print_png(png_output)
+        AppMetrics.report_render_seconds.labels("reorder_level").observe(time.perf_counter() - render_start)
         response = make_response(png_output.getvalue())
         response.headers['Content-Type'] = 'image/png'
         return response
@@ -2,14 +2,16 @@ import datetime
 
 from flask import Blueprint, render_template, request, current_app, session
 from flask_login import current_user
+from sqlalchemy import bindparam
 from sqlalchemy.exc import SQLAlchemyError
 
+from POS.app_logging import sampled_debug
 from POS.blueprints.base.app_view import AppView
+from POS.metrics import AppMetrics
 from POS.models.sales.line_item import LineItem
 from POS.models.sales.sales_transaction import SalesTransaction
 from POS.models.stock_management.product import Product
-from POS.models.user_management.business import Business
-from POS.utils import is_cashier, selected_business, business_is_active
+from POS.utils import is_cashier, selected_business, business_is_active, rate_limited
 
 
 class CheckoutAPI(AppView):
@@ -32,6 +34,7 @@ class SalesAPI(AppView):
         pass
 
     @staticmethod
+    @rate_limited("sales")
     @is_cashier
     @selected_business
     @business_is_active
@@ -45,7 +48,7 @@ class SalesAPI(AppView):
                 status=400
             )
 
-        print("Sales request: %s" % new_sales_request)
+        sampled_debug("Sales request: %s", new_sales_request)
 
         if not SalesAPI.validate_new_product_request(new_sales_request):
             return SalesAPI.send_response(
@@ -59,38 +62,63 @@ class SalesAPI(AppView):
                 # Get info
                 amount_given = new_sales_request["transaction"]["amount_given"]
                 current_time = datetime.datetime.now()
+                business_id = session["business_id"]
+
+                # Get the products of the whole cart at once, only those of the current business can be sold
+                cart_product_ids = {int(line_item_request["product_id"])
+                                    for line_item_request in new_sales_request["line_items"]}
+                product_ids = {product_id for product_id, in AppDB.db_session.query(Product.id).filter(
+                    Product.id.in_(cart_product_ids),
+                    Product.business_id == business_id
+                )}
 
                 # Model sales transaction
                 sales_transaction = SalesTransaction(timestamp=current_time, amount_given=amount_given)
 
-                sales_transaction.business = AppDB.db_session.query(Business).get(session["business_id"])
-                sales_transaction.user = current_user
-
-                # Add line items to the transaction
-                for line_item_request in new_sales_request["line_items"]:
-                    # Get the product associated with the line item
-                    product = AppDB.db_session.query(Product).get(line_item_request["product_id"])
-
-                    if product:
-                        # Model a line item
-                        line_item = LineItem(
-                            name=line_item_request["name"],
-                            quantity=int(line_item_request["quantity"]),
-                            price=float(line_item_request["selling_price"])
-                        )
-                        line_item.product = product
-
-                        product.quantity -= int(line_item_request["quantity"])
-
-                        line_item.sales_transaction = sales_transaction
+                sales_transaction.business_id = business_id
+                sales_transaction.cashier_id = current_user.emp_id
 
                 AppDB.db_session.add(sales_transaction)
+                # Get the id of the transaction for its line items
+                AppDB.db_session.flush()
+
+                # Model the line items of the products found
+                line_items = [dict(
+                    name=line_item_request["name"],
+                    quantity=int(line_item_request["quantity"]),
+                    price=float(line_item_request["selling_price"]),
+                    product_id=int(line_item_request["product_id"]),
+                    sales_transaction_id=sales_transaction.id
+                ) for line_item_request in new_sales_request["line_items"]
+                    if int(line_item_request["product_id"]) in product_ids]
+
+                if line_items:
+                    # One INSERT and one UPDATE for the whole cart, the stock is decremented
+                    # in the database so concurrent sales of a product don't overwrite each other
+                    AppDB.db_session.bulk_insert_mappings(LineItem, line_items)
+                    AppDB.db_session.execute(
+                        Product.__table__.update().where(
+                            Product.__table__.c.id == bindparam("sold_product_id")
+                        ).values(
+                            quantity=Product.__table__.c.quantity - bindparam("sold_quantity")
+                        ),
+                        [dict(sold_product_id=line_item["product_id"], sold_quantity=line_item["quantity"])
+                         for line_item in line_items]
+                    )
+
                 AppDB.db_session.commit()
 
+                AppMetrics.checkout_line_items.inc(len(line_items))
+
             return SalesAPI.send_response(
                 msg="Still working on it",
                 status=200
             )
+        except ValueError:
+            # Product ids or quantities that are not numbers
+            from POS import AppDB
+            AppDB.db_session.rollback()
+            return SalesAPI.validation_error_response()
         except SQLAlchemyError as e:
             from POS import AppDB
             AppDB.db_session.rollback()
@@ -2,6 +2,7 @@ from flask import Blueprint, request, current_app, render_template, session
 
 from sqlalchemy.exc import SQLAlchemyError
 
+from POS.app_logging import sampled_debug
 from POS.blueprints.base.app_view import AppView
 from POS.models.base_model import AppDB
 from POS.models.stock_management.supplier import Supplier
@@ -163,7 +164,7 @@ class SuppliersAPI(AppView):
                 Product.business_id == session["business_id"]
         ).all()
 
-        print("Suppliers: %s" % suppliers)
+        sampled_debug("Suppliers: %s", suppliers)
 
         return [
             dict(
@@ -2,6 +2,7 @@ from flask import Blueprint, render_template, request, current_app
 from flask_login import login_user, current_user
 
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import undefer
 
 
 from POS.constants import APP_NAME
@@ -9,7 +10,9 @@ from POS.constants import APP_NAME
 from POS.blueprints.base.app_view import AppView
 
 from POS.models.base_model import AppDB
+from POS.models.user_management.password_hasher import PasswordHashingBusy
 from POS.models.user_management.user import User
+from POS.utils import rate_limited
 
 
 class Login(AppView):
@@ -22,6 +25,7 @@ class Login(AppView):
         )
 
     @staticmethod
+    @rate_limited("login")
     def post():
         """
             Validate user identity
@@ -48,8 +52,8 @@ class Login(AppView):
         password = user_request["password"].strip().lower()
 
         try:
-            # Find user by that email
-            user = AppDB.db_session.query(User).filter(
+            # Find user by that email (the only place the password hash is loaded)
+            user = AppDB.db_session.query(User).options(undefer(User.password)).filter(
                 User.email == email
             ).first()
 
@@ -61,6 +65,10 @@ class Login(AppView):
 
             # User exists, so confirm password
             if user.confirm_password(password):
+                # Save the password hash if it was upgraded to the current hashing parameters
+                if user in AppDB.db_session.dirty:
+                    AppDB.db_session.commit()
+
                 # Register user with login manager
                 login_user(user)
 
@@ -78,6 +86,10 @@ class Login(AppView):
             current_app.logger.error(e)
             current_app.sentry.captureException()
             return Login.error_in_processing_request()
+        except PasswordHashingBusy as e:
+            AppDB.db_session.rollback()
+            current_app.logger.warning("Login for %s not processed: %s" % (email, e))
+            return Login.service_busy_response()
 
     @staticmethod
     def request_is_filled(client_request):
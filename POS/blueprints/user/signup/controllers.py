@@ -6,7 +6,9 @@ from sqlalchemy.exc import SQLAlchemyError
 from POS.blueprints.base.app_view import AppView
 from POS.constants import APP_NAME
 from POS.models.base_model import AppDB
+from POS.models.user_management.password_hasher import PasswordHashingBusy
 from POS.models.user_management.user import User
+from POS.utils import rate_limited
 
 
 class SignUp(AppView):
@@ -16,6 +18,7 @@ class SignUp(AppView):
         return render_template("signup.html", title="%s: %s" % (APP_NAME, "Signup"))
 
     @staticmethod
+    @rate_limited("signup")
     def post():
         user_request = request.get_json()
 
@@ -64,6 +67,10 @@ class SignUp(AppView):
                     current_app.logger.error(e)
                     current_app.sentry.captureException()
                     return SignUp.error_in_processing_request()
+                except PasswordHashingBusy as e:
+                    AppDB.db_session.rollback()
+                    current_app.logger.warning("Signup for %s not processed: %s" % (user_request["email"], e))
+                    return SignUp.service_busy_response()
             else:
                 return SignUp.send_response(
                     msg="Fill in all details",
@@ -1,22 +1,77 @@
 import os
 
-import redis
-
-from .constants import APP_NAME, DATABASE_URL, TESTING_DATABASE_URL, REDIS_URL_ENV_VAR, LOCAL_REDIS_URL
+from .constants import APP_NAME, DATABASE_URL, TESTING_DATABASE_URL, SESSION_KEY_PREFIX
+from .models.redis_store import AppRedis
 
 
 class BaseConfig(object):
     SQLALCHEMY_DATABASE_URI = DATABASE_URL
+    # Postgres schema holding the tables, the default search path (public) when not set
+    SQLALCHEMY_DATABASE_SCHEMA = None
+    # Migrate the database to the latest revision when the app starts. Off by default: deployments run
+    # `flask db upgrade` once as a release step instead of every process running the DDL (see POS.migrations)
+    MIGRATE_ON_START = os.environ.get(APP_NAME + "_MIGRATE_ON_START", "false").lower() == "true"
     SECRET_KEY = os.environ.get(APP_NAME + "_SECRET_KEY")
 
     SESSION_TYPE = "redis"
-    SESSION_REDIS = redis.from_url(os.environ.get(REDIS_URL_ENV_VAR, LOCAL_REDIS_URL))
+    SESSION_REDIS = AppRedis.get_client()
+    SESSION_KEY_PREFIX = SESSION_KEY_PREFIX
     SESSION_PERMANENT = False
 
+    # Logs are written as JSON lines by a background thread, the file is rotated daily or once it reaches LOG_MAX_BYTES
+    LOG_FILE = APP_NAME + ".log"
+    LOG_MAX_BYTES = 10 * 1024 * 1024
+    LOG_ROTATE_WHEN = "midnight"
+    LOG_BACKUP_COUNT = 14
+    LOG_LEVELS = {
+        "flask.app": os.environ.get(APP_NAME + "_LOG_LEVEL", "INFO"),
+        "werkzeug": "INFO",
+        "apscheduler": "WARNING",
+        "sqlalchemy.engine": "WARNING"
+    }
+    # Fraction of the sampled debug logs (e.g. request dumps in hot paths) that are written
+    DEBUG_LOG_SAMPLE_RATE = 0.01
+
+    # Prometheus metrics on /metrics (see POS.metrics for running several processes),
+    # scrapers send METRICS_AUTH_TOKEN as a bearer token when it is set
+    METRICS_ENABLED = os.environ.get(APP_NAME + "_METRICS_ENABLED", "true").lower() == "true"
+    METRICS_AUTH_TOKEN = os.environ.get(APP_NAME + "_METRICS_AUTH_TOKEN")
+
+    # Statements slower than the threshold are logged and recorded for `flask slow-queries`,
+    # the first slow run of each SELECT shape also records its EXPLAIN (ANALYZE, BUFFERS)
+    SLOW_QUERY_LOG_ENABLED = True
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get(APP_NAME + "_SLOW_QUERY_THRESHOLD_MS", 200))
+    SLOW_QUERY_EXPLAIN_ENABLED = True
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS = 5000
+
+    # Profiling of single requests (by owners and admins sending PROFILING_HEADER) and sampling of workers.
+    # When disabled, the profiling hooks and endpoints are not installed at all
+    PROFILING_ENABLED = os.environ.get(APP_NAME + "_PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_HEADER = "X-Profile"
+    PROFILE_TTL_SECONDS = 60 * 60
+    PROFILING_MAX_SAMPLE_SECONDS = 60
+    PROFILING_SAMPLE_INTERVAL_MS = 10
+
+    # Number of proxies (e.g. the Heroku router) in front of the app, trusted for the client address
+    PROXY_COUNT = int(os.environ.get(APP_NAME + "_PROXY_COUNT", 1))
+
+    # Token bucket limits: bucket size and tokens refilled per second.
+    # Login, signup and sales are limited per client IP and email, billing callbacks per client account
+    RATE_LIMITING_ENABLED = True
+    RATE_LIMITS = dict(
+        login=dict(capacity=10, refill_per_second=0.2),
+        signup=dict(capacity=5, refill_per_second=0.05),
+        billing=dict(capacity=30, refill_per_second=1),
+        sales=dict(capacity=60, refill_per_second=2)
+    )
+
 
 class DevelopmentConfig(BaseConfig):
     SQLALCHEMY_TRACK_MODIFICATIONS = True
     DEBUG = True
+    MIGRATE_ON_START = True
+    LOG_LEVELS = dict(BaseConfig.LOG_LEVELS, **{"flask.app": os.environ.get(APP_NAME + "_LOG_LEVEL", "DEBUG")})
+    DEBUG_LOG_SAMPLE_RATE = 1.0
 
 
 class ProductionConfig(BaseConfig):
@@ -26,5 +81,11 @@ class ProductionConfig(BaseConfig):
 
 class TestingConfig(BaseConfig):
     SQLALCHEMY_DATABASE_URI = TESTING_DATABASE_URL
+    # Set per worker when the tests run in parallel (see conftest.py)
+    SQLALCHEMY_DATABASE_SCHEMA = os.environ.get(APP_NAME + "_TEST_DATABASE_SCHEMA")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    MIGRATE_ON_START = True
     DEBUG = False
+    # Tests log in repeatedly from the same address
+    RATE_LIMITING_ENABLED = False
+    PROFILING_ENABLED = True
@@ -16,7 +16,38 @@ TESTING_DATABASE_URL = os.getenv(TESTING_DATABASE_URL_ENV_NAME)
 
 # Session management
 REDIS_URL_ENV_VAR = "REDISCLOUD_URL"
-LOCAL_REDIS_URL = "127.0.0.1:6379"
+LOCAL_REDIS_URL = "redis://127.0.0.1:6379"
+SESSION_KEY_PREFIX = "session:"
+
+# Small integers stored in place of the well known session keys to keep session payloads compact
+SESSION_KEY_ALIASES = {
+    "_user_id": 1,
+    "_fresh": 2,
+    "_id": 3,
+    "_remember": 4,
+    "business_id": 10,
+    "business_name": 11,
+    "role": 12,
+    "billing_job_id": 13
+}
+
+# Redis connection pool (shared by sessions, caches and queues)
+REDIS_KEY_PREFIX = os.getenv(APP_NAME + "_REDIS_KEY_PREFIX", APP_NAME.lower())
+REDIS_MAX_CONNECTIONS = int(os.getenv(APP_NAME + "_REDIS_MAX_CONNECTIONS", 50))
+REDIS_POOL_TIMEOUT_IN_SECONDS = float(os.getenv(APP_NAME + "_REDIS_POOL_TIMEOUT", 5))
+REDIS_SOCKET_TIMEOUT_IN_SECONDS = float(os.getenv(APP_NAME + "_REDIS_SOCKET_TIMEOUT", 5))
+REDIS_SOCKET_CONNECT_TIMEOUT_IN_SECONDS = float(os.getenv(APP_NAME + "_REDIS_SOCKET_CONNECT_TIMEOUT", 2))
+REDIS_HEALTH_CHECK_INTERVAL_IN_SECONDS = int(os.getenv(APP_NAME + "_REDIS_HEALTH_CHECK_INTERVAL", 30))
+
+# Users
+USER_PRINCIPAL_CACHE_TTL_IN_SECONDS = int(os.getenv(APP_NAME + "_USER_PRINCIPAL_CACHE_TTL", 60))
+
+# Password hashing (PBKDF2 work factor and the size of the process pool doing the hashing)
+PASSWORD_HASH_ITERATIONS = int(os.getenv(APP_NAME + "_PASSWORD_HASH_ITERATIONS", 50000))
+PASSWORD_HASH_METHOD = "pbkdf2:sha256:%d" % PASSWORD_HASH_ITERATIONS
+PASSWORD_HASHING_WORKERS = int(os.getenv(APP_NAME + "_PASSWORD_HASHING_WORKERS", 2))
+PASSWORD_HASHING_MAX_PENDING = int(os.getenv(APP_NAME + "_PASSWORD_HASHING_MAX_PENDING", 32))
+PASSWORD_HASHING_TIMEOUT_IN_SECONDS = float(os.getenv(APP_NAME + "_PASSWORD_HASHING_TIMEOUT", 10))
 
 # Roles
 ROLES_YAML_ENV_VAR = APP_NAME + "_ROLES"
@@ -0,0 +1,174 @@
+"""
+    This module measures where the time of each request goes: wall time, SQL statements
+    (count, time and rows fetched) and Redis calls. The measures of a request are kept in
+    flask.g, added as a Server-Timing header in debug mode and aggregated per endpoint
+"""
+
+import bisect
+import threading
+import time
+
+from blinker import Namespace
+from flask import g, has_request_context, request, request_started, request_finished
+from sqlalchemy import event
+
+# Sent once the measures of a request are complete, with the response and its RequestMetrics
+request_measured = Namespace().signal("request-measured")
+
+
+class RequestMetrics(object):
+    """
+        Measures of the request being processed
+    """
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.wall_seconds = 0.0
+        self.sql_count = 0
+        self.db_seconds = 0.0
+        self.rows_fetched = 0
+        self.redis_calls = 0
+        self.redis_seconds = 0.0
+
+    def server_timing(self):
+        """
+            Formats the measures as a Server-Timing header value (durations in milliseconds)
+        :return:
+        """
+        return ", ".join((
+            "app;dur=%.2f" % (self.wall_seconds * 1000),
+            "db;dur=%.2f;desc=\"%d queries, %d rows\"" % (self.db_seconds * 1000, self.sql_count, self.rows_fetched),
+            "redis;dur=%.2f;desc=\"%d calls\"" % (self.redis_seconds * 1000, self.redis_calls)
+        ))
+
+
+def current_request_metrics():
+    """
+        Returns the measures of the current request, None outside requests (e.g. billing jobs)
+    :return: RequestMetrics or None
+    """
+    if has_request_context():
+        return g.get("request_metrics")
+    return None
+
+
+class EndpointStats(object):
+    """
+        Latency histogram and totals of the requests served by one endpoint in this process
+    """
+    # Upper bounds of the latency buckets in seconds, the last bucket counts slower requests
+    LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(EndpointStats.LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.wall_seconds = 0.0
+        self.sql_count = 0
+        self.db_seconds = 0.0
+        self.rows_fetched = 0
+        self.redis_calls = 0
+
+    def observe(self, metrics):
+        self.bucket_counts[bisect.bisect_left(EndpointStats.LATENCY_BUCKETS, metrics.wall_seconds)] += 1
+        self.count += 1
+        self.wall_seconds += metrics.wall_seconds
+        self.sql_count += metrics.sql_count
+        self.db_seconds += metrics.db_seconds
+        self.rows_fetched += metrics.rows_fetched
+        self.redis_calls += metrics.redis_calls
+
+    def to_dict(self):
+        return dict(
+            count=self.count,
+            latency_buckets=dict(zip(
+                [str(bound) for bound in EndpointStats.LATENCY_BUCKETS] + ["+Inf"],
+                self.bucket_counts
+            )),
+            wall_seconds=self.wall_seconds,
+            sql_count=self.sql_count,
+            db_seconds=self.db_seconds,
+            rows_fetched=self.rows_fetched,
+            redis_calls=self.redis_calls
+        )
+
+
+class RequestInstrumentation(object):
+    endpoint_stats = {}
+    stats_lock = threading.Lock()
+
+    @staticmethod
+    def init_app(app_instance, db_engine):
+        """
+            Hooks the request signals of the app and the events of its database engine
+        :param app_instance: Flask app instance
+        :param db_engine: SQLAlchemy engine used by the app
+        :return:
+        """
+        request_started.connect(RequestInstrumentation.start_request, app_instance)
+        request_finished.connect(RequestInstrumentation.finish_request, app_instance)
+
+        event.listen(db_engine, "before_cursor_execute", RequestInstrumentation.before_cursor_execute)
+        event.listen(db_engine, "after_cursor_execute", RequestInstrumentation.after_cursor_execute)
+
+    @staticmethod
+    def start_request(sender, **extra):
+        g.request_metrics = RequestMetrics()
+
+    @staticmethod
+    def finish_request(sender, response, **extra):
+        metrics = current_request_metrics()
+        if metrics is None:
+            return
+
+        metrics.wall_seconds = time.perf_counter() - metrics.start
+
+        # Unmatched URLs (404s) have no endpoint
+        endpoint = request.endpoint or "unknown"
+        with RequestInstrumentation.stats_lock:
+            if endpoint not in RequestInstrumentation.endpoint_stats:
+                RequestInstrumentation.endpoint_stats[endpoint] = EndpointStats()
+            RequestInstrumentation.endpoint_stats[endpoint].observe(metrics)
+
+        if sender.debug:
+            response.headers["Server-Timing"] = metrics.server_timing()
+
+        request_measured.send(sender, response=response, metrics=metrics)
+
+    @staticmethod
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @staticmethod
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        query_seconds = time.perf_counter() - conn.info["query_start_time"].pop()
+
+        metrics = current_request_metrics()
+        if metrics is None:
+            return
+
+        metrics.sql_count += 1
+        metrics.db_seconds += query_seconds
+
+        # Statements returning rows (SELECT, ... RETURNING) report how many they returned
+        if cursor.description is not None and cursor.rowcount > 0:
+            metrics.rows_fetched += cursor.rowcount
+
+    @staticmethod
+    def record_redis_call(seconds):
+        metrics = current_request_metrics()
+        if metrics is None:
+            return
+
+        metrics.redis_calls += 1
+        metrics.redis_seconds += seconds
+
+    @staticmethod
+    def stats():
+        """
+            Per endpoint latency histograms and totals of the requests served by this process
+        :return: dict of endpoint to EndpointStats.to_dict()
+        """
+        with RequestInstrumentation.stats_lock:
+            return {
+                endpoint: endpoint_stats.to_dict()
+                for endpoint, endpoint_stats in RequestInstrumentation.endpoint_stats.items()
+            }
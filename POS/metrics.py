@@ -0,0 +1,156 @@
+"""
+    This module defines the Prometheus metrics of the app (served by the metrics blueprint).
+    When the app runs in several processes (e.g. gunicorn workers), set the prometheus_multiproc_dir
+    environment variable to an empty directory before starting them, so that every process writes
+    its samples there and /metrics serves their sum
+"""
+
+import os
+
+from flask import request
+from prometheus_client import Counter, Gauge, Histogram, CollectorRegistry, REGISTRY
+from prometheus_client.core import CounterMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy import event
+
+from POS.instrumentation import request_measured
+from POS.models.rate_limiter import RateLimiter
+from POS.models.redis_store import AppRedis
+
+MULTIPROCESS_DIR_ENV_VAR = "prometheus_multiproc_dir"
+
+
+class RateLimiterCollector(object):
+    """
+        Reports the rate limiter counters, which are kept in Redis for all processes
+    """
+    def __init__(self, scopes):
+        self.scopes = list(scopes)
+
+    def collect(self):
+        requests = CounterMetricFamily(
+            "lipaless_rate_limited_requests",
+            "Requests checked by the rate limiter",
+            labels=["scope", "result"]
+        )
+        for scope, counts in RateLimiter.stats(self.scopes).items():
+            for result, count in counts.items():
+                requests.add_metric([scope, result], count)
+        yield requests
+
+
+class AppMetrics(object):
+    request_latency = Histogram(
+        "lipaless_request_duration_seconds",
+        "Time taken to process requests",
+        ["blueprint", "method", "status"]
+    )
+    request_sql_statements = Counter(
+        "lipaless_request_sql_statements",
+        "SQL statements executed while processing requests",
+        ["blueprint"]
+    )
+    request_db_seconds = Counter(
+        "lipaless_request_db_seconds",
+        "Time spent executing SQL while processing requests",
+        ["blueprint"]
+    )
+
+    db_pool_checked_out = Gauge(
+        "lipaless_db_pool_checked_out_connections",
+        "Database connections checked out of the pool",
+        multiprocess_mode="livesum"
+    )
+    redis_pool_connections = Gauge(
+        "lipaless_redis_pool_connections",
+        "Redis connections of the pool by state",
+        ["state"],
+        multiprocess_mode="livesum"
+    )
+
+    billing_run_seconds = Histogram(
+        "lipaless_billing_run_duration_seconds",
+        "Time taken to bill a business for an interval"
+    )
+    businesses_billed = Counter(
+        "lipaless_businesses_billed",
+        "Businesses whose e-wallet was debited for an interval"
+    )
+    checkout_line_items = Counter(
+        "lipaless_checkout_line_items",
+        "Line items sold at checkout"
+    )
+    report_render_seconds = Histogram(
+        "lipaless_report_render_duration_seconds",
+        "Time taken to draw report graphs",
+        ["report"]
+    )
+
+    @staticmethod
+    def init_app(app_instance, db_engine):
+        """
+            Records the metrics of every request and of the database connection pool
+        :param app_instance: Flask app instance
+        :param db_engine: SQLAlchemy engine used by the app
+        :return:
+        """
+        request_measured.connect(AppMetrics.observe_request, app_instance)
+
+        # Connections may have been checked out (e.g. by the app's session) before the listeners existed
+        AppMetrics.db_pool_checked_out.set(db_engine.pool.checkedout())
+        event.listen(db_engine, "checkout", AppMetrics.on_db_checkout)
+        event.listen(db_engine, "checkin", AppMetrics.on_db_checkin)
+
+    @staticmethod
+    def observe_request(sender, response, metrics, **extra):
+        blueprint = request.blueprint or "app"
+
+        AppMetrics.request_latency.labels(
+            blueprint,
+            request.method,
+            response.status_code
+        ).observe(metrics.wall_seconds)
+        AppMetrics.request_sql_statements.labels(blueprint).inc(metrics.sql_count)
+        AppMetrics.request_db_seconds.labels(blueprint).inc(metrics.db_seconds)
+
+        AppMetrics.update_redis_pool_connections()
+
+    @staticmethod
+    def update_redis_pool_connections():
+        pool_stats = AppRedis.pool_stats()
+        for state in ("in_use", "idle"):
+            AppMetrics.redis_pool_connections.labels(state).set(pool_stats[state])
+
+    @staticmethod
+    def on_db_checkout(dbapi_connection, connection_record, connection_proxy):
+        AppMetrics.db_pool_checked_out.inc()
+
+    @staticmethod
+    def on_db_checkin(dbapi_connection, connection_record):
+        AppMetrics.db_pool_checked_out.dec()
+
+    @staticmethod
+    def registry(rate_limit_scopes):
+        """
+            Builds the registry to serve, merging the samples of all processes in multiprocess mode
+        :param rate_limit_scopes: Scopes of the rate limiter to report
+        :return: CollectorRegistry
+        """
+        AppMetrics.update_redis_pool_connections()
+
+        registry = CollectorRegistry()
+        if os.environ.get(MULTIPROCESS_DIR_ENV_VAR):
+            MultiProcessCollector(registry)
+        else:
+            registry.register(ProcessRegistryCollector())
+
+        registry.register(RateLimiterCollector(rate_limit_scopes))
+        return registry
+
+
+class ProcessRegistryCollector(object):
+    """
+        Serves the metrics of the default registry (single process mode) from another registry
+    """
+    def collect(self):
+        return REGISTRY.collect()
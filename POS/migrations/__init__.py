@@ -0,0 +1,158 @@
+"""
+    This module versions the database schema with Alembic migrations (the scripts in versions/).
+    Deployments run `flask db upgrade` as a release step, development and test databases are
+    upgraded when the app starts (MIGRATE_ON_START). The other `flask db` commands create
+    and inspect the migrations
+"""
+
+import contextlib
+import os
+
+import click
+from alembic import command
+from alembic.config import Config
+from flask.cli import with_appcontext
+from sqlalchemy import func, select
+
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Revision of the schema the app created with metadata.create_all() before it had migrations
+INITIAL_REVISION = "0001"
+
+# Postgres advisory lock taken while migrating, so that app processes starting together
+# don't run the same migrations at the same time
+MIGRATION_LOCK_ID = 7356281
+
+
+class AppMigrations(object):
+
+    @staticmethod
+    def init_app(app_instance):
+        app_instance.cli.add_command(db_command)
+
+    @staticmethod
+    def get_config(connection):
+        """
+            Alembic configuration running the migrations on the connection
+        :param connection: SQLAlchemy connection
+        :return: alembic.config.Config
+        """
+        config = Config()
+        config.set_main_option("script_location", MIGRATIONS_DIR)
+        config.attributes["connection"] = connection
+        return config
+
+    @staticmethod
+    def run(engine, alembic_command, *args, **kwargs):
+        """
+            Runs an Alembic command on a connection of the engine, holding the migration lock on Postgres.
+            A database whose tables predate the migrations is stamped with the INITIAL_REVISION first
+        :param engine: SQLAlchemy engine
+        :param alembic_command: Function of alembic.command
+        :return: What the command returns
+        """
+        with AppMigrations.migration_lock(engine):
+            with engine.connect() as connection:
+                config = AppMigrations.get_config(connection)
+
+                if not connection.dialect.has_table(connection, "alembic_version") and \
+                        connection.dialect.has_table(connection, "business"):
+                    command.stamp(config, INITIAL_REVISION)
+
+                return alembic_command(config, *args, **kwargs)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def migration_lock(engine):
+        """
+            Holds the Postgres advisory lock of the migrations. It is taken on a connection of its own in
+            autocommit mode: a process waiting for the lock must not sit in a transaction, which the
+            CREATE INDEX CONCURRENTLY of the process holding the lock would wait for in turn
+        :param engine: SQLAlchemy engine
+        :return:
+        """
+        if engine.dialect.name != "postgresql":
+            yield
+            return
+
+        with engine.connect() as lock_connection:
+            lock_connection = lock_connection.execution_options(isolation_level="AUTOCOMMIT")
+            lock_connection.execute(select([func.pg_advisory_lock(MIGRATION_LOCK_ID)]))
+            try:
+                yield
+            finally:
+                lock_connection.execute(select([func.pg_advisory_unlock(MIGRATION_LOCK_ID)]))
+
+    @staticmethod
+    def upgrade(engine, revision="head"):
+        """
+            Migrates the database to the revision
+        :param engine: SQLAlchemy engine
+        :param revision: Target revision, the latest one by default
+        :return:
+        """
+        AppMigrations.run(engine, command.upgrade, revision)
+
+
+@click.group("db")
+def db_command():
+    """
+        Database migrations
+    """
+
+
+@db_command.command("upgrade")
+@click.argument("revision", default="head")
+@with_appcontext
+def upgrade_command(revision):
+    """
+        Migrates the database to REVISION (the latest by default) and loads the default roles
+    """
+    from POS.models.base_model import AppDB
+    from POS.models.user_management.role import Role
+
+    AppMigrations.upgrade(AppDB.db_engine, revision)
+    AppDB.load_default_roles(Role)
+
+
+@db_command.command("downgrade")
+@click.argument("revision")
+@with_appcontext
+def downgrade_command(revision):
+    """
+        Reverts the database to REVISION (e.g. -1 for the previous one)
+    """
+    from POS.models.base_model import AppDB
+    AppMigrations.run(AppDB.db_engine, command.downgrade, revision)
+
+
+@db_command.command("current")
+@with_appcontext
+def current_command():
+    """
+        Shows the revision of the database
+    """
+    from POS.models.base_model import AppDB
+    AppMigrations.run(AppDB.db_engine, command.current, verbose=True)
+
+
+@db_command.command("history")
+@with_appcontext
+def history_command():
+    """
+        Lists the migrations
+    """
+    from POS.models.base_model import AppDB
+    AppMigrations.run(AppDB.db_engine, command.history)
+
+
+@db_command.command("revision")
+@click.option("-m", "--message", required=True, help="What the migration does")
+@click.option("--autogenerate", is_flag=True, help="Draft the migration from the differences between the models and the database")
+@with_appcontext
+def revision_command(message, autogenerate):
+    """
+        Creates a migration script in POS/migrations/versions
+    """
+    from POS.models.base_model import AppDB
+    AppMigrations.run(AppDB.db_engine, command.revision, message=message, autogenerate=autogenerate)
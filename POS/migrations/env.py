@@ -0,0 +1,20 @@
+"""
+    Alembic environment of the app. The migrations run on the connection passed by AppMigrations
+    (config.attributes["connection"]), compared against the models for autogenerate
+"""
+
+from alembic import context
+
+from POS.models.base_model import AppDB
+
+config = context.config
+
+context.configure(
+    connection=config.attributes["connection"],
+    target_metadata=AppDB.BaseModel.metadata,
+    # Each migration commits on its own, a failing one leaves the earlier ones applied
+    transaction_per_migration=True
+)
+
+with context.begin_transaction():
+    context.run_migrations()
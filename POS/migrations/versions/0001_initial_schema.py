@@ -0,0 +1,135 @@
+"""
+    The schema the app created with metadata.create_all() before it had migrations.
+    Databases created back then are stamped with this revision instead of running it
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 15:46:30.892189
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('business',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('contact_number', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('lipalessuser',
+    sa.Column('emp_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('password', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('emp_id'),
+    sa.UniqueConstraint('email')
+    )
+    op.create_table('manufacturer',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('role',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('supplier',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('contact_person', sa.String(), nullable=True),
+    sa.Column('contact_no', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('category',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('business_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['business_id'], ['business.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('ewallet',
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('balance', sa.Integer(), nullable=True),
+    sa.Column('business_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['business_id'], ['business.id'], ),
+    sa.PrimaryKeyConstraint('account_id')
+    )
+    op.create_table('sales_transaction',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(), nullable=False),
+    sa.Column('amount_given', sa.Float(), nullable=False),
+    sa.Column('cashier_id', sa.Integer(), nullable=False),
+    sa.Column('business_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['business_id'], ['business.id'], ),
+    sa.ForeignKeyConstraint(['cashier_id'], ['lipalessuser.emp_id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('user_business',
+    sa.Column('emp_id', sa.Integer(), nullable=False),
+    sa.Column('business_id', sa.Integer(), nullable=False),
+    sa.Column('role_id', sa.Integer(), nullable=False),
+    sa.Column('is_deactivated', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['business_id'], ['business.id'], ),
+    sa.ForeignKeyConstraint(['emp_id'], ['lipalessuser.emp_id'], ),
+    sa.ForeignKeyConstraint(['role_id'], ['role.id'], ),
+    sa.PrimaryKeyConstraint('emp_id', 'business_id', 'role_id')
+    )
+    op.create_table('billing_transaction',
+    sa.Column('transaction_id', sa.Integer(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(), nullable=True),
+    sa.Column('amount', sa.Float(), nullable=True),
+    sa.Column('account_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['account_id'], ['ewallet.account_id'], ),
+    sa.PrimaryKeyConstraint('transaction_id')
+    )
+    op.create_table('product',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('buying_price', sa.Float(), nullable=False),
+    sa.Column('selling_price', sa.Float(), nullable=False),
+    sa.Column('reorder_level', sa.Integer(), nullable=True),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('business_id', sa.Integer(), nullable=True),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['business_id'], ['business.id'], ),
+    sa.ForeignKeyConstraint(['category_id'], ['category.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('line_item',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('price', sa.Float(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('sales_transaction_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['product.id'], ),
+    sa.ForeignKeyConstraint(['sales_transaction_id'], ['sales_transaction.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('line_item')
+    op.drop_table('product')
+    op.drop_table('billing_transaction')
+    op.drop_table('user_business')
+    op.drop_table('sales_transaction')
+    op.drop_table('ewallet')
+    op.drop_table('category')
+    op.drop_table('supplier')
+    op.drop_table('role')
+    op.drop_table('manufacturer')
+    op.drop_table('lipalessuser')
+    op.drop_table('business')
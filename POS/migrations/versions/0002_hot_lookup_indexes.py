@@ -0,0 +1,40 @@
+"""
+    Indexes the foreign keys the requests filter and join on.
+    user_business.emp_id already leads its primary key, its business_id is indexed instead.
+    The indexes are built CONCURRENTLY, outside of a transaction, so that the sales keep going
+    while they are built on a live database
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 15:52:04.118734
+"""
+
+from alembic import op
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_product_business_id', 'product', ['business_id']),
+    ('ix_category_business_id', 'category', ['business_id']),
+    ('ix_ewallet_business_id', 'ewallet', ['business_id']),
+    ('ix_sales_transaction_business_id_timestamp', 'sales_transaction', ['business_id', 'timestamp']),
+    ('ix_line_item_sales_transaction_id', 'line_item', ['sales_transaction_id']),
+    ('ix_billing_transaction_account_id', 'billing_transaction', ['account_id']),
+    ('ix_user_business_business_id', 'user_business', ['business_id']),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for index_name, table_name, columns in INDEXES:
+            op.create_index(index_name, table_name, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for index_name, table_name, _ in reversed(INDEXES):
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True)
@@ -1,10 +1,12 @@
 """
-    This module uses SQLAlchemy to create the database structures (if they do not exist)
+    This module uses SQLAlchemy and the migrations in POS.migrations to create or upgrade the database structures
     and exposes a database session object to be used by the app
 """
 
 from flask import current_app
 
+from POS.constants import APP_NAME
+
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -14,6 +16,7 @@ class AppDB(object):
     # Create the BaseModel model through which all other models will be declared
     BaseModel = declarative_base()
     db_session = None
+    db_engine = None
 
     # noinspection PyUnresolvedReferences
     @staticmethod
@@ -32,16 +35,29 @@ class AppDB(object):
         from POS.models.sales.sales_transaction import SalesTransaction
         from POS.models.sales.line_item import LineItem
         # from POS.models.stock_management.supplier_manufacturer import SupplierManufacturer
+        from POS.migrations import AppMigrations
 
 
         try:
+            engine_options = {}
+
+            # Keep the tables in a schema of their own (e.g. one per parallel test worker)
+            schema = current_app.config.get("SQLALCHEMY_DATABASE_SCHEMA")
+            if schema:
+                engine_options["connect_args"] = dict(options="-csearch_path=%s" % schema)
+
             db_engine = create_engine(
                 current_app.config["SQLALCHEMY_DATABASE_URI"],
-                isolation_level='READ COMMITTED'
+                isolation_level='READ COMMITTED',
+                **engine_options
             )
 
+            if schema:
+                db_engine.execute('CREATE SCHEMA IF NOT EXISTS "%s"' % schema)
+
             # Bind the engine to the models
             AppDB.BaseModel.metadata.bind = db_engine
+            AppDB.db_engine = db_engine
 
             # Create a session object to be used by the app to do any DB transaction
             # noinspection PyPep8Naming
@@ -51,17 +67,41 @@ class AppDB(object):
 
             AppDB.db_session = Session()
 
-            # Create all structures
-            # AppDB.BaseModel.metadata.drop_all()
-            AppDB.BaseModel.metadata.create_all()
+            # Create or upgrade all structures
+            if current_app.config["MIGRATE_ON_START"]:
+                AppMigrations.upgrade(db_engine)
 
-            # Load default user roles
-            AppDB.load_default_roles(Role)
+            # Load default user roles, once the migrations created the tables
+            # (the app is also loaded to run `flask db upgrade` on an empty database)
+            if AppDB.has_schema():
+                AppDB.load_default_roles(Role)
+            else:
+                current_app.logger.warning("The database has no tables yet, run `flask db upgrade`")
 
         except AttributeError:
             current_app.logger.error("Database URL attribute not found or provided")
             raise
 
+    @staticmethod
+    def has_schema():
+        """
+            Checks whether the migrations created the tables of the app
+        :return: bool
+        """
+        with AppDB.db_engine.connect() as connection:
+            return AppDB.db_engine.dialect.has_table(connection, "role")
+
+    @staticmethod
+    def verify_schema():
+        """
+            Stops the app from serving an empty database, which the migrations were not run on
+        :return:
+        """
+        if not AppDB.has_schema():
+            raise RuntimeError(
+                "The database has no tables: run `flask db upgrade` (or set %s_MIGRATE_ON_START=true)" % APP_NAME
+            )
+
     # noinspection PyPep8Naming
     @staticmethod
     def load_default_roles(Role):
@@ -80,4 +120,7 @@ class AppDB(object):
             if not existing_role:
                 role = Role(role_name, role_description)
                 AppDB.db_session.add(role)
-                AppDB.db_session.commit()
+
+        # End the transaction of the lookups too, an idle transaction left open would hold up
+        # the migrations (CREATE INDEX CONCURRENTLY) of the other processes
+        AppDB.db_session.commit()
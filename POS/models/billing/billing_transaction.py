@@ -16,7 +16,7 @@ class BillingTransaction(AppDB.BaseModel):
     transaction_id = Column(Integer, primary_key=True)
     timestamp = Column(DateTime)
     amount = Column(Float)
-    account_id = Column(Integer, ForeignKey("ewallet.account_id"))
+    account_id = Column(Integer, ForeignKey("ewallet.account_id"), index=True)
 
     # Relationships
     ewallet = relationship("EWallet", back_populates="billing_transactions")
@@ -17,7 +17,7 @@ class EWallet(AppDB.BaseModel):
     account_id = Column(Integer, primary_key=True)
     balance = Column(Integer)
 
-    business_id = Column(Integer, ForeignKey("business.id"))
+    business_id = Column(Integer, ForeignKey("business.id"), index=True)
 
     # Relationships
     business = relationship("Business", back_populates="ewallet")
@@ -26,10 +26,10 @@ class EWallet(AppDB.BaseModel):
     def __init__(self, balance=constants.BILLING_AMOUNT_PER_INTERVAL_IN_SHILLINGS):
         # Keep generating random account IDs while making sure they are unique
         unique_account_id = constants.MINIMUM_PAYMENT_ID + \
-                          (random.random() * constants.MAXIMUM_PAYMENT_ID)
+                          int(random.random() * constants.MAXIMUM_PAYMENT_ID)
         while EWallet.exists(unique_account_id):
             unique_account_id = constants.MINIMUM_PAYMENT_ID + \
-                              (random.random() * constants.MAXIMUM_PAYMENT_ID)
+                              int(random.random() * constants.MAXIMUM_PAYMENT_ID)
 
         self.account_id = unique_account_id
         self.balance = balance
@@ -0,0 +1,93 @@
+"""
+    This module implements a Redis token bucket rate limiter shared by all the app processes
+"""
+
+import time
+
+from POS.models.redis_store import AppRedis
+
+
+class RateLimiter(object):
+    # KEYS: the buckets to take a token from, followed by the stats hash of the scope
+    # ARGV: bucket capacity, tokens refilled per second, current time in seconds
+    # Takes a token from every bucket only if all of them have one
+    TOKEN_BUCKET_SCRIPT = """
+        local capacity = tonumber(ARGV[1])
+        local refill_per_second = tonumber(ARGV[2])
+        local now = tonumber(ARGV[3])
+        local bucket_ttl = math.ceil(capacity / refill_per_second)
+        local stats_key = KEYS[#KEYS]
+
+        local tokens = {}
+        local allowed = 1
+        local retry_after = 0
+
+        for i = 1, #KEYS - 1 do
+            local bucket = redis.call("HMGET", KEYS[i], "tokens", "updated_at")
+            local bucket_tokens = tonumber(bucket[1]) or capacity
+            local updated_at = tonumber(bucket[2]) or now
+
+            bucket_tokens = math.min(capacity, bucket_tokens + math.max(0, now - updated_at) * refill_per_second)
+            if bucket_tokens < 1 then
+                allowed = 0
+                retry_after = math.max(retry_after, (1 - bucket_tokens) / refill_per_second)
+            end
+            tokens[i] = bucket_tokens
+        end
+
+        for i = 1, #KEYS - 1 do
+            redis.call("HMSET", KEYS[i], "tokens", tokens[i] - allowed, "updated_at", now)
+            redis.call("EXPIRE", KEYS[i], bucket_ttl)
+        end
+
+        redis.call("HINCRBY", stats_key, allowed == 1 and "allowed" or "rejected", 1)
+        return {allowed, tostring(retry_after)}
+    """
+    token_bucket = None
+
+    @staticmethod
+    def consume(scope, identities, capacity, refill_per_second):
+        """
+            Takes a token from the bucket of each identity (e.g. client IP, email) within a scope
+        :param scope: Name of the limited action e.g. login
+        :param identities: dict of identity type to value e.g. dict(ip="127.0.0.1")
+        :param capacity: Bucket size i.e. allowed burst
+        :param refill_per_second: Sustained rate allowed
+        :return: (allowed, seconds to wait before retrying)
+        """
+        if RateLimiter.token_bucket is None:
+            RateLimiter.token_bucket = AppRedis.get_client().register_script(RateLimiter.TOKEN_BUCKET_SCRIPT)
+
+        bucket_keys = [
+            AppRedis.key("rate_limit", scope, identity_type, identity)
+            for identity_type, identity in sorted(identities.items())
+        ]
+
+        allowed, retry_after = RateLimiter.token_bucket(
+            keys=bucket_keys + [RateLimiter.stats_key(scope)],
+            args=[capacity, refill_per_second, time.time()]
+        )
+        return allowed == 1, float(retry_after)
+
+    @staticmethod
+    def stats_key(scope):
+        return AppRedis.key("rate_limit_stats", scope)
+
+    @staticmethod
+    def stats(scopes):
+        """
+            Counts of allowed and rejected requests per scope, across all processes
+        :param scopes: Scope names
+        :return: dict of scope to dict(allowed=..., rejected=...)
+        """
+        pipeline = AppRedis.get_client().pipeline(transaction=False)
+        for scope in scopes:
+            pipeline.hgetall(RateLimiter.stats_key(scope))
+
+        return {
+            scope: dict(
+                allowed=int(counts.get(b"allowed", 0)),
+                rejected=int(counts.get(b"rejected", 0))
+            )
+            for scope, counts in zip(scopes, pipeline.execute())
+        }
@@ -0,0 +1,100 @@
+"""
+    This module creates the single pooled Redis client used by the app
+    (session storage, caches and queues) so that every process keeps one connection pool
+"""
+
+import os
+import time
+
+import redis
+from redis.client import Pipeline
+
+from POS.instrumentation import RequestInstrumentation
+from POS.constants import REDIS_URL_ENV_VAR, LOCAL_REDIS_URL, REDIS_KEY_PREFIX, REDIS_MAX_CONNECTIONS, \
+    REDIS_POOL_TIMEOUT_IN_SECONDS, REDIS_SOCKET_TIMEOUT_IN_SECONDS, REDIS_SOCKET_CONNECT_TIMEOUT_IN_SECONDS, \
+    REDIS_HEALTH_CHECK_INTERVAL_IN_SECONDS
+
+
+class InstrumentedRedis(redis.StrictRedis):
+    """
+        Redis client recording the calls made while processing a request (see POS.instrumentation)
+    """
+    def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return super(InstrumentedRedis, self).execute_command(*args, **options)
+        finally:
+            RequestInstrumentation.record_redis_call(time.perf_counter() - start)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+class InstrumentedPipeline(Pipeline):
+    """
+        Pipeline recording each execute() as a single Redis call
+    """
+    def execute(self, raise_on_error=True):
+        start = time.perf_counter()
+        try:
+            return super(InstrumentedPipeline, self).execute(raise_on_error)
+        finally:
+            RequestInstrumentation.record_redis_call(time.perf_counter() - start)
+
+
+class AppRedis(object):
+    connection_pool = None
+    client = None
+
+    @staticmethod
+    def get_client():
+        """
+            Returns the shared Redis client, creating its connection pool on first use.
+            The pool blocks (up to REDIS_POOL_TIMEOUT_IN_SECONDS) instead of failing
+            when all connections are checked out
+        :return: InstrumentedRedis (redis.StrictRedis) instance
+        """
+        if AppRedis.client is None:
+            AppRedis.connection_pool = redis.BlockingConnectionPool.from_url(
+                os.environ.get(REDIS_URL_ENV_VAR, LOCAL_REDIS_URL),
+                max_connections=REDIS_MAX_CONNECTIONS,
+                timeout=REDIS_POOL_TIMEOUT_IN_SECONDS,
+                socket_timeout=REDIS_SOCKET_TIMEOUT_IN_SECONDS,
+                socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT_IN_SECONDS,
+                health_check_interval=REDIS_HEALTH_CHECK_INTERVAL_IN_SECONDS,
+                retry_on_timeout=True
+            )
+            AppRedis.client = InstrumentedRedis(connection_pool=AppRedis.connection_pool)
+        return AppRedis.client
+
+    @staticmethod
+    def key(*parts):
+        """
+            Builds a namespaced key for data the app caches in Redis e.g. key("user", 4) -> "lipaless:user:4"
+        :param parts: Key components
+        :return: Redis key
+        """
+        return ":".join(str(part) for part in (REDIS_KEY_PREFIX,) + parts)
+
+    @staticmethod
+    def pool_stats():
+        """
+            Reports how much of the connection pool is in use, for monitoring
+        :return: dict with max_connections, created, in_use and idle counts
+        """
+        pool = AppRedis.connection_pool
+
+        if pool is None:
+            return dict(max_connections=REDIS_MAX_CONNECTIONS, created=0, in_use=0, idle=0)
+
+        # redis-py (3.5) has no public API for this: the blocking pool keeps idle connections
+        # in a queue padded with None placeholders and every connection it created in _connections
+        idle = sum(1 for connection in list(pool.pool.queue) if connection is not None)
+        created = len(pool._connections)
+
+        return dict(
+            max_connections=pool.max_connections,
+            created=created,
+            in_use=created - idle,
+            idle=idle
+        )
@@ -14,7 +14,7 @@ class LineItem(AppDB.BaseModel):
 
     # Foreign fields
     product_id = Column(Integer, ForeignKey("product.id"), nullable=False)
-    sales_transaction_id = Column(Integer, ForeignKey("sales_transaction.id"), nullable=False)
+    sales_transaction_id = Column(Integer, ForeignKey("sales_transaction.id"), nullable=False, index=True)
 
     # Relationships
     product = relationship("Product", back_populates="line_item")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from POS.models.base_model import AppDB
@@ -6,6 +6,10 @@ from POS.models.base_model import AppDB
 
 class SalesTransaction(AppDB.BaseModel):
     __tablename__ = "sales_transaction"
+    __table_args__ = (
+        # The sales of a business are looked up by time period
+        Index("ix_sales_transaction_business_id_timestamp", "business_id", "timestamp"),
+    )
 
     id = Column(Integer, primary_key=True)
     timestamp = Column(DateTime, nullable=False)
@@ -12,7 +12,7 @@ class Category(AppDB.BaseModel):
     description = Column(String)
 
     # Foreign fields
-    business_id = Column(Integer, ForeignKey("business.id"), nullable=False)
+    business_id = Column(Integer, ForeignKey("business.id"), nullable=False, index=True)
 
     # Relationships
     products = relationship("Product", back_populates="category")
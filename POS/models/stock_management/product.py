@@ -15,7 +15,7 @@ class Product(AppDB.BaseModel):
     reorder_level = Column(Integer)
     quantity = Column(Integer, nullable=False)
     # Foreign keys
-    business_id = Column(Integer, ForeignKey("business.id"))
+    business_id = Column(Integer, ForeignKey("business.id"), index=True)
     category_id = Column(Integer, ForeignKey("category.id"))
     # supplier_id = Column(Integer, ForeignKey("supplier.id"))
     # manufacturer_id = Column(Integer, ForeignKey("manufacturer.id"))
@@ -0,0 +1,88 @@
+"""
+    This module hashes and checks passwords in a bounded pool of worker processes so that
+    the CPU heavy PBKDF2 work does not run in (and stall) the request threads
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from POS.constants import PASSWORD_HASH_METHOD, PASSWORD_HASHING_WORKERS, PASSWORD_HASHING_MAX_PENDING, \
+    PASSWORD_HASHING_TIMEOUT_IN_SECONDS
+
+
+class PasswordHashingBusy(Exception):
+    """
+        Raised when a password cannot be hashed in time (queue full, slow or crashed workers),
+        the request should be retried later
+    """
+    pass
+
+
+class PasswordHasher(object):
+    executor = None
+    executor_pid = None
+    executor_lock = threading.Lock()
+
+    # Bounds the hashing work queued up by a process, extra callers wait for a slot
+    pending_slots = threading.BoundedSemaphore(PASSWORD_HASHING_MAX_PENDING)
+
+    @staticmethod
+    def get_executor():
+        """
+            Returns the process pool, (re)creating it in processes forked after it was created
+            (e.g. gunicorn workers) since a pool cannot be shared across a fork
+        :return: ProcessPoolExecutor
+        """
+        with PasswordHasher.executor_lock:
+            if PasswordHasher.executor is None or PasswordHasher.executor_pid != os.getpid():
+                PasswordHasher.executor = ProcessPoolExecutor(max_workers=PASSWORD_HASHING_WORKERS)
+                PasswordHasher.executor_pid = os.getpid()
+            return PasswordHasher.executor
+
+    @staticmethod
+    def run(func, *args):
+        # A pool of 0 workers hashes in the calling thread
+        if PASSWORD_HASHING_WORKERS <= 0:
+            return func(*args)
+
+        if not PasswordHasher.pending_slots.acquire(timeout=PASSWORD_HASHING_TIMEOUT_IN_SECONDS):
+            raise PasswordHashingBusy("Password hashing queue is full")
+
+        try:
+            future = PasswordHasher.get_executor().submit(func, *args)
+            return future.result(timeout=PASSWORD_HASHING_TIMEOUT_IN_SECONDS)
+        except FutureTimeoutError:
+            raise PasswordHashingBusy("Password hashing timed out")
+        except BrokenProcessPool:
+            # A worker died, the next call gets a new pool
+            with PasswordHasher.executor_lock:
+                PasswordHasher.executor = None
+            raise PasswordHashingBusy("Password hashing worker crashed")
+        finally:
+            PasswordHasher.pending_slots.release()
+
+    @staticmethod
+    def hash_password(password):
+        """
+            Hashes a password with the configured work factor (PASSWORD_HASH_METHOD)
+        :param password: Plain text password
+        :return: Password hash
+        """
+        return PasswordHasher.run(generate_password_hash, password, PASSWORD_HASH_METHOD)
+
+    @staticmethod
+    def check_password(password_hash, password):
+        return PasswordHasher.run(check_password_hash, password_hash, password)
+
+    @staticmethod
+    def needs_rehash(password_hash):
+        """
+            Checks if a hash was created with different parameters than the configured ones
+        :param password_hash: Stored password hash e.g. pbkdf2:sha256:50000$salt$hash
+        :return: True if the password should be hashed again
+        """
+        return password_hash.split("$", 1)[0] != PASSWORD_HASH_METHOD
@@ -1,10 +1,14 @@
-from werkzeug.security import generate_password_hash, check_password_hash
+import json
+
 from sqlalchemy import Column, Integer, String
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 
 from flask_login import UserMixin
 
+from POS.constants import USER_PRINCIPAL_CACHE_TTL_IN_SECONDS
 from POS.models.base_model import AppDB
+from POS.models.redis_store import AppRedis
+from POS.models.user_management.password_hasher import PasswordHasher
 
 
 class User(AppDB.BaseModel, UserMixin):
@@ -17,7 +21,8 @@ class User(AppDB.BaseModel, UserMixin):
     emp_id = Column(Integer, primary_key=True)
     name = Column(String)
     email = Column(String, unique=True)
-    password = Column(String)
+    # Only loaded when explicitly undeferred (i.e. on login)
+    password = deferred(Column(String))
 
     # Specify relationships
     businesses = relationship(
@@ -29,7 +34,7 @@ class User(AppDB.BaseModel, UserMixin):
     def __init__(self, name, email, password):
         self.name = name
         self.email = email
-        self.password = generate_password_hash(password)
+        self.password = PasswordHasher.hash_password(password)
 
     def __repr__(self):
         return "User<name=%s, email=%s>" % (
@@ -38,15 +43,81 @@ class User(AppDB.BaseModel, UserMixin):
         )
 
     def get_id(self):
-        return self.emp_id
+        return str(self.emp_id)
 
     def confirm_password(self, proposed_password):
         """
-        Checks if a provided password is the correct user's password
+        Checks if a provided password is the correct user's password.
+        If the password was hashed with outdated parameters, it is hashed again
+        (the caller commits the new hash)
         :param proposed_password: Provided password by user
         :return: True is the password is correct, False otherwise
         """
-        return check_password_hash(
-            pwhash=self.password,
-            password=proposed_password
+        if not PasswordHasher.check_password(self.password, proposed_password):
+            return False
+
+        if PasswordHasher.needs_rehash(self.password):
+            self.password = PasswordHasher.hash_password(proposed_password)
+
+        return True
+
+
+class UserPrincipal(UserMixin):
+    """
+        Lightweight identity of a logged in user, loaded by Flask-Login on every authenticated request.
+        It carries no password hash and is cached in Redis for USER_PRINCIPAL_CACHE_TTL_IN_SECONDS
+    """
+    def __init__(self, emp_id, name, email):
+        self.emp_id = emp_id
+        self.name = name
+        self.email = email
+
+    def __repr__(self):
+        return "UserPrincipal<emp_id=%s, email=%s>" % (
+            self.emp_id,
+            self.email
+        )
+
+    def get_id(self):
+        return str(self.emp_id)
+
+    @staticmethod
+    def cache_key(emp_id):
+        return AppRedis.key("user_principal", emp_id)
+
+    @staticmethod
+    def load(emp_id):
+        """
+            Gets the principal of a user from the cache, falling back to the database
+        :param emp_id: User's emp_id
+        :return: UserPrincipal, None if no user has that emp_id
+        """
+        redis_db = AppRedis.get_client()
+
+        cached_principal = redis_db.get(UserPrincipal.cache_key(emp_id))
+        if cached_principal:
+            return UserPrincipal(**json.loads(cached_principal))
+
+        user = AppDB.db_session.query(User.emp_id, User.name, User.email).filter(
+            User.emp_id == emp_id
+        ).first()
+
+        if not user:
+            return None
+
+        principal = UserPrincipal(emp_id=user.emp_id, name=user.name, email=user.email)
+        redis_db.setex(
+            UserPrincipal.cache_key(emp_id),
+            USER_PRINCIPAL_CACHE_TTL_IN_SECONDS,
+            json.dumps(dict(emp_id=principal.emp_id, name=principal.name, email=principal.email))
         )
+        return principal
+
+    @staticmethod
+    def invalidate(emp_id):
+        """
+            Drops the cached principal of a user whose account changed
+        :param emp_id: User's emp_id
+        :return:
+        """
+        AppRedis.get_client().delete(UserPrincipal.cache_key(emp_id))
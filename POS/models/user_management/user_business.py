@@ -11,7 +11,7 @@ class UserBusiness(AppDB.BaseModel):
     __tablename__ = "user_business"
 
     emp_id = Column(Integer, ForeignKey("lipalessuser.emp_id"), primary_key=True)
-    business_id = Column(Integer, ForeignKey("business.id"), primary_key=True)
+    business_id = Column(Integer, ForeignKey("business.id"), primary_key=True, index=True)
     role_id = Column(Integer, ForeignKey("role.id"), primary_key=True)
     is_deactivated = Column(Boolean, nullable=False)
 
@@ -0,0 +1,215 @@
+"""
+    This module profiles the app in production without redeploying it (only when PROFILING_ENABLED is set,
+    otherwise none of its hooks are installed):
+        - an owner or admin sends the PROFILING_HEADER with a request to run it under cProfile, the stats
+          are stored in Redis for PROFILE_TTL_SECONDS and their id returned in the X-Profile-Id header
+        - the sampling profiler snapshots the stacks of every thread of a worker for a few seconds and
+          counts them as collapsed stacks (the input of flamegraph.pl and speedscope)
+"""
+
+import cProfile
+import collections
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+
+from flask import g, request, session
+from flask_login import current_user
+
+from POS.constants import OWNER_ROLE_NAME, ADMIN_ROLE_NAME
+from POS.models.redis_store import AppRedis
+
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+
+class StoredProfile(object):
+    """
+        cProfile stats loaded back from Redis, in the form pstats.Stats accepts
+    """
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class RequestProfiler(object):
+    app = None
+
+    @staticmethod
+    def init_app(app_instance):
+        """
+            Profiles the requests that ask for it
+        :param app_instance: Flask app instance
+        :return:
+        """
+        RequestProfiler.app = app_instance
+
+        app_instance.before_request(RequestProfiler.start_profile)
+        app_instance.after_request(RequestProfiler.stop_profile)
+
+    @staticmethod
+    def profiling_allowed():
+        # The role is the one of the user in the business selected for the session
+        return current_user.is_authenticated and session.get("role") in (OWNER_ROLE_NAME, ADMIN_ROLE_NAME)
+
+    @staticmethod
+    def start_profile():
+        if RequestProfiler.app.config["PROFILING_HEADER"] not in request.headers:
+            return
+
+        if not RequestProfiler.profiling_allowed():
+            RequestProfiler.app.logger.warning("Profiling of %s refused for an unauthorized user" % request.path)
+            return
+
+        g.profile = cProfile.Profile()
+        g.profile.enable()
+
+    @staticmethod
+    def stop_profile(response):
+        profile = g.pop("profile", None)
+        if profile is None:
+            return response
+
+        profile.disable()
+        profile.create_stats()
+
+        profile_id = uuid.uuid4().hex
+        AppRedis.get_client().setex(
+            RequestProfiler.profile_key(profile_id),
+            RequestProfiler.app.config["PROFILE_TTL_SECONDS"],
+            marshal.dumps(profile.stats)
+        )
+        RequestProfiler.app.logger.info("Profiled %s %s as %s" % (request.method, request.path, profile_id))
+
+        response.headers[PROFILE_ID_HEADER] = profile_id
+        return response
+
+    @staticmethod
+    def profile_key(profile_id):
+        return AppRedis.key("profile", profile_id)
+
+    @staticmethod
+    def load(profile_id):
+        """
+            Gets stored profile stats in the pstats file format (e.g. for snakeviz)
+        :param profile_id: Id returned in the X-Profile-Id header
+        :return: bytes or None if the profile expired
+        """
+        return AppRedis.get_client().get(RequestProfiler.profile_key(profile_id))
+
+    @staticmethod
+    def format(profile_data, sort_by="cumulative", limit=50):
+        """
+            Formats stored profile stats as the pstats report
+        :param profile_data: Stats returned by load()
+        :param sort_by: pstats sort key
+        :param limit: Number of functions to report
+        :return: str
+        """
+        report = io.StringIO()
+        pstats.Stats(StoredProfile(marshal.loads(profile_data)), stream=report) \
+            .strip_dirs() \
+            .sort_stats(sort_by) \
+            .print_stats(limit)
+        return report.getvalue()
+
+
+class SamplingProfiler(object):
+    """
+        Periodically snapshots the stacks of all the threads of this process (sys._current_frames)
+        from a background thread. The profiled threads do no extra work, their cost is the sampling
+        thread holding the GIL for a few microseconds every interval
+    """
+    # Only one sampler per process
+    lock = threading.Lock()
+
+    def __init__(self, seconds, interval):
+        self.seconds = seconds
+        self.interval = interval
+        self.sample_count = 0
+        self.stacks = collections.Counter()
+
+    @staticmethod
+    def frame_name(frame):
+        code = frame.f_code
+        return "%s (%s:%d)" % (code.co_name, os.path.basename(code.co_filename), code.co_firstlineno)
+
+    def take_sample(self):
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        own_thread_id = threading.get_ident()
+
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread_id:
+                continue
+
+            stack = []
+            while frame is not None:
+                stack.append(SamplingProfiler.frame_name(frame))
+                frame = frame.f_back
+            stack.append(thread_names.get(thread_id, "thread-%d" % thread_id))
+
+            self.stacks[";".join(reversed(stack))] += 1
+        self.sample_count += 1
+
+    def run(self):
+        """
+            Samples for the configured duration, in the calling thread
+        :return: self
+        """
+        deadline = time.perf_counter() + self.seconds
+        while time.perf_counter() < deadline:
+            self.take_sample()
+            time.sleep(self.interval)
+        return self
+
+    def collapsed_stacks(self):
+        """
+            One line per distinct stack: the frames from the thread down to the leaf separated by ";",
+            then the number of samples in which it was seen
+        :return: str
+        """
+        return "\n".join("%s %d" % (stack, count) for stack, count in sorted(self.stacks.items()))
+
+    @staticmethod
+    def sample_key(sample_id):
+        return AppRedis.key("profile_sample", sample_id)
+
+    @staticmethod
+    def start(seconds, interval, ttl):
+        """
+            Samples this process in a background thread and stores the collapsed stacks in Redis
+        :param seconds: How long to sample for
+        :param interval: Seconds between samples
+        :param ttl: Seconds the result is kept
+        :return: Id of the result or None when this process is already being sampled
+        """
+        if not SamplingProfiler.lock.acquire(blocking=False):
+            return None
+
+        sample_id = uuid.uuid4().hex
+
+        def sample():
+            try:
+                profiler = SamplingProfiler(seconds, interval).run()
+                AppRedis.get_client().setex(SamplingProfiler.sample_key(sample_id), ttl, profiler.collapsed_stacks())
+            finally:
+                SamplingProfiler.lock.release()
+
+        threading.Thread(target=sample, name="sampling-profiler", daemon=True).start()
+        return sample_id
+
+    @staticmethod
+    def load(sample_id):
+        """
+            Gets the collapsed stacks of a finished sampling run
+        :param sample_id: Id returned by start()
+        :return: str or None while sampling or once the result expired
+        """
+        collapsed_stacks = AppRedis.get_client().get(SamplingProfiler.sample_key(sample_id))
+        return collapsed_stacks.decode("utf-8") if collapsed_stacks is not None else None
@@ -0,0 +1,124 @@
+"""
+    This module provides the Redis session interface used by the app.
+    Sessions are stored in a compact msgpack encoding and are only written back
+    to Redis when a request actually modifies them
+"""
+
+import pickle
+import uuid
+
+import msgpack
+from flask_session.sessions import RedisSessionInterface, total_seconds
+
+from .constants import SESSION_KEY_ALIASES
+
+
+class CompactSessionCodec(object):
+    """
+        Serializes session dictionaries with msgpack, replacing the well known session keys
+        with small integers. Sessions holding values msgpack cannot encode fall back to pickle
+    """
+    MSGPACK_MARKER = b"m"
+    PICKLE_MARKER = b"p"
+
+    KEY_TO_ALIAS = SESSION_KEY_ALIASES
+    ALIAS_TO_KEY = {alias: key for key, alias in SESSION_KEY_ALIASES.items()}
+
+    # Text values stored as raw bytes: (encode, decode) per session key
+    BINARY_VALUES = {
+        # Flask-Login's session identifier is a sha512 hex digest
+        "_id": (bytes.fromhex, bytes.hex),
+        "billing_job_id": (lambda value: uuid.UUID(value).bytes, lambda value: str(uuid.UUID(bytes=value)))
+    }
+
+    @staticmethod
+    def dumps(session_data):
+        try:
+            compact_data = {
+                CompactSessionCodec.KEY_TO_ALIAS.get(key, key): CompactSessionCodec.encode_value(key, value)
+                for key, value in session_data.items()
+            }
+            return CompactSessionCodec.MSGPACK_MARKER + msgpack.packb(compact_data, use_bin_type=True)
+        except (TypeError, ValueError):
+            return CompactSessionCodec.PICKLE_MARKER + pickle.dumps(session_data, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def loads(raw_data):
+        marker, payload = raw_data[:1], raw_data[1:]
+
+        if marker == CompactSessionCodec.PICKLE_MARKER:
+            return pickle.loads(payload)
+
+        if marker != CompactSessionCodec.MSGPACK_MARKER:
+            raise ValueError("Unknown session encoding")
+
+        compact_data = msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        session_data = {}
+
+        for alias, value in compact_data.items():
+            key = CompactSessionCodec.ALIAS_TO_KEY.get(alias, alias)
+            session_data[key] = CompactSessionCodec.decode_value(key, value)
+
+        return session_data
+
+    @staticmethod
+    def encode_value(key, value):
+        if key in CompactSessionCodec.BINARY_VALUES and isinstance(value, str):
+            return CompactSessionCodec.BINARY_VALUES[key][0](value)
+        return value
+
+    @staticmethod
+    def decode_value(key, value):
+        if key in CompactSessionCodec.BINARY_VALUES and isinstance(value, bytes):
+            return CompactSessionCodec.BINARY_VALUES[key][1](value)
+        return value
+
+
+class CompactRedisSessionInterface(RedisSessionInterface):
+    """
+        Redis session interface that skips rewriting the session (and the Set-Cookie header)
+        on requests that leave it untouched, e.g. read only GETs. Only its expiry is refreshed
+    """
+    serializer = CompactSessionCodec
+
+    def save_session(self, app, session, response):
+        if session and not session.modified:
+            # Slide the expiry of the stored session (as the full save would) without rewriting it
+            self.redis.expire(self.key_prefix + session.sid, total_seconds(app.permanent_session_lifetime))
+
+            if self.should_set_cookie(app, session):
+                self.set_session_cookie(app, session, response)
+            return
+
+        super(CompactRedisSessionInterface, self).save_session(app, session, response)
+
+    def set_session_cookie(self, app, session, response):
+        if self.use_signer:
+            session_id = self._get_signer(app).sign(session.sid.encode("utf-8"))
+        else:
+            session_id = session.sid
+
+        response.set_cookie(
+            app.session_cookie_name,
+            session_id,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=self.get_cookie_domain(app),
+            path=self.get_cookie_path(app),
+            secure=self.get_cookie_secure(app)
+        )
+
+    @staticmethod
+    def init_app(app_instance):
+        """
+            Replace the interface created by Flask-Session with the compact one,
+            keeping the same Redis client and key prefix
+        :param app_instance: Flask app instance
+        :return:
+        """
+        app_instance.session_interface = CompactRedisSessionInterface(
+            redis=app_instance.config["SESSION_REDIS"],
+            key_prefix=app_instance.config["SESSION_KEY_PREFIX"],
+            use_signer=app_instance.config.get("SESSION_USE_SIGNER", False),
+            permanent=app_instance.config["SESSION_PERMANENT"]
+        )
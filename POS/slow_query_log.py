@@ -0,0 +1,234 @@
+"""
+    This module logs SQL statements slower than SLOW_QUERY_THRESHOLD_MS together with the endpoint
+    that ran them. Slow statements are grouped by shape (the statement text with its parameter names
+    and types) in Redis, the first slow run of a SELECT shape captures its EXPLAIN (ANALYZE, BUFFERS)
+    and the `flask slow-queries` command summarizes the worst shapes
+"""
+
+import hashlib
+import json
+import re
+import time
+
+import click
+from flask import has_request_context, request
+from flask.cli import with_appcontext
+from redis import RedisError
+from sqlalchemy import event
+
+from POS.models.redis_store import AppRedis
+
+
+class SlowQueryLog(object):
+    app = None
+    db_engine = None
+
+    @staticmethod
+    def init_app(app_instance, db_engine):
+        """
+            Times the statements run by the database engine of the app
+        :param app_instance: Flask app instance
+        :param db_engine: SQLAlchemy engine used by the app
+        :return:
+        """
+        SlowQueryLog.app = app_instance
+        SlowQueryLog.db_engine = db_engine
+
+        event.listen(db_engine, "before_cursor_execute", SlowQueryLog.before_cursor_execute)
+        event.listen(db_engine, "after_cursor_execute", SlowQueryLog.after_cursor_execute)
+
+        app_instance.cli.add_command(slow_queries_command)
+
+    @staticmethod
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start_time", []).append(time.perf_counter())
+
+    @staticmethod
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - conn.info["slow_query_start_time"].pop()) * 1000
+
+        config = SlowQueryLog.app.config
+        if not config["SLOW_QUERY_LOG_ENABLED"] or duration_ms < config["SLOW_QUERY_THRESHOLD_MS"]:
+            return
+
+        endpoint = (request.endpoint or request.path) if has_request_context() else "background"
+        parameter_shape = SlowQueryLog.parameter_shape(parameters, executemany)
+
+        SlowQueryLog.app.logger.warning("Slow query (%.1f ms) in %s: %s %s" % (
+            duration_ms,
+            endpoint,
+            SlowQueryLog.normalize(statement),
+            parameter_shape
+        ))
+
+        try:
+            SlowQueryLog.record(statement, parameters, parameter_shape, endpoint, duration_ms)
+        except RedisError as e:
+            SlowQueryLog.app.logger.error(e)
+
+    @staticmethod
+    def normalize(statement):
+        return re.sub(r"\s+", " ", statement).strip()
+
+    @staticmethod
+    def parameter_shape(parameters, executemany):
+        """
+            Describes the bound parameters without their values e.g. {product_id_1: int}
+        :param parameters: Parameters passed to the DBAPI cursor
+        :param executemany: Whether the parameters are a list of parameter sets
+        :return: str
+        """
+        if executemany:
+            return "%s x %d" % (SlowQueryLog.parameter_shape(parameters[0], False), len(parameters)) \
+                if parameters else "[]"
+
+        if isinstance(parameters, dict):
+            return "{%s}" % ", ".join(
+                "%s: %s" % (name, type(value).__name__) for name, value in sorted(parameters.items())
+            )
+        return "(%s)" % ", ".join(type(value).__name__ for value in parameters or ())
+
+    @staticmethod
+    def shape_id(statement, parameter_shape):
+        return hashlib.sha1(
+            (SlowQueryLog.normalize(statement) + parameter_shape).encode("utf-8")
+        ).hexdigest()[:16]
+
+    @staticmethod
+    def shape_key(shape_id):
+        return AppRedis.key("slow_query", shape_id)
+
+    @staticmethod
+    def ranking_key():
+        # Shapes ranked by the total time spent running them slowly
+        return AppRedis.key("slow_queries", "total_ms")
+
+    @staticmethod
+    def record(statement, parameters, parameter_shape, endpoint, duration_ms):
+        shape_id = SlowQueryLog.shape_id(statement, parameter_shape)
+        shape_key = SlowQueryLog.shape_key(shape_id)
+
+        pipeline = AppRedis.get_client().pipeline(transaction=False)
+        pipeline.hsetnx(shape_key, "statement", SlowQueryLog.normalize(statement))
+        pipeline.hset(shape_key, "parameter_shape", parameter_shape)
+        pipeline.hset(shape_key, "last_endpoint", endpoint)
+        pipeline.hincrby(shape_key, "count", 1)
+        pipeline.hincrbyfloat(shape_key, "total_ms", duration_ms)
+        pipeline.zincrby(SlowQueryLog.ranking_key(), duration_ms, shape_id)
+        first_occurrence = pipeline.execute()[0]
+
+        if first_occurrence and SlowQueryLog.app.config["SLOW_QUERY_EXPLAIN_ENABLED"] and \
+                SlowQueryLog.is_explainable(statement):
+            AppRedis.get_client().hset(shape_key, "explain", SlowQueryLog.explain(statement, parameters))
+
+    @staticmethod
+    def is_explainable(statement):
+        """
+            Only plain SELECTs are analyzed: EXPLAIN ANALYZE runs the statement, and a locking SELECT
+            would wait for the locks held by the connection that just ran it
+        :param statement:
+        :return:
+        """
+        statement = SlowQueryLog.normalize(statement).upper()
+        return statement.startswith("SELECT") and not re.search(r"\bFOR (UPDATE|NO KEY UPDATE|SHARE|KEY SHARE)\b", statement)
+
+    @staticmethod
+    def explain(statement, parameters):
+        """
+            Runs EXPLAIN (ANALYZE, BUFFERS) of a SELECT on a separate connection, in a transaction
+            that is rolled back and bounded by SLOW_QUERY_EXPLAIN_TIMEOUT_MS
+        :param statement: SELECT statement as sent to the DBAPI cursor
+        :param parameters: Its parameters
+        :return: Query plan text
+        """
+        connection = SlowQueryLog.db_engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SET LOCAL statement_timeout = %d" % SlowQueryLog.app.config["SLOW_QUERY_EXPLAIN_TIMEOUT_MS"])
+            cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters)
+            return "\n".join(row[0] for row in cursor.fetchall())
+        except Exception as e:
+            # The plan is a diagnostic, never fail the request over it
+            SlowQueryLog.app.logger.error("EXPLAIN of slow query failed: %s" % e)
+            return "EXPLAIN failed: %s" % e
+        finally:
+            connection.rollback()
+            connection.close()
+
+    @staticmethod
+    def top_offenders(limit):
+        """
+            Gets the shapes on which most time was spent running slowly
+        :param limit: Number of shapes
+        :return: list of dicts
+        """
+        redis_db = AppRedis.get_client()
+        ranking = redis_db.zrevrange(SlowQueryLog.ranking_key(), 0, limit - 1)
+
+        pipeline = redis_db.pipeline(transaction=False)
+        for shape_id in ranking:
+            pipeline.hgetall(SlowQueryLog.shape_key(shape_id.decode("utf-8")))
+
+        offenders = []
+        for shape_id, shape in zip(ranking, pipeline.execute()):
+            shape = {field.decode("utf-8"): value.decode("utf-8") for field, value in shape.items()}
+            count = int(shape.get("count", 0))
+            total_ms = float(shape.get("total_ms", 0))
+
+            offenders.append(dict(
+                shape_id=shape_id.decode("utf-8"),
+                count=count,
+                total_ms=round(total_ms, 1),
+                mean_ms=round(total_ms / count, 1) if count else 0,
+                statement=shape.get("statement"),
+                parameter_shape=shape.get("parameter_shape"),
+                last_endpoint=shape.get("last_endpoint"),
+                explain=shape.get("explain")
+            ))
+        return offenders
+
+    @staticmethod
+    def reset():
+        redis_db = AppRedis.get_client()
+        for shape_id in redis_db.zrange(SlowQueryLog.ranking_key(), 0, -1):
+            redis_db.delete(SlowQueryLog.shape_key(shape_id.decode("utf-8")))
+        redis_db.delete(SlowQueryLog.ranking_key())
+
+
+@click.command("slow-queries")
+@click.option("--limit", default=10, help="Number of statement shapes to show")
+@click.option("--explain", is_flag=True, help="Show the captured query plans")
+@click.option("--as-json", is_flag=True, help="Print the summary as JSON")
+@click.option("--reset", is_flag=True, help="Forget the recorded slow queries")
+@with_appcontext
+def slow_queries_command(limit, explain, as_json, reset):
+    """
+        Summarizes the slowest statement shapes recorded by all the app processes
+    """
+    if reset:
+        SlowQueryLog.reset()
+        click.echo("Slow queries cleared")
+        return
+
+    offenders = SlowQueryLog.top_offenders(limit)
+
+    if as_json:
+        click.echo(json.dumps(offenders, indent=2))
+        return
+
+    if not offenders:
+        click.echo("No slow queries recorded")
+
+    for rank, offender in enumerate(offenders, start=1):
+        click.echo("%d. %s: %d runs, %.1f ms total, %.1f ms mean, last in %s" % (
+            rank,
+            offender["shape_id"],
+            offender["count"],
+            offender["total_ms"],
+            offender["mean_ms"],
+            offender["last_endpoint"]
+        ))
+        click.echo("   %s %s" % (offender["statement"], offender["parameter_shape"]))
+
+        if explain and offender["explain"]:
+            click.echo("\n".join("      " + line for line in offender["explain"].splitlines()))
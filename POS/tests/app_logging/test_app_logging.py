@@ -0,0 +1,99 @@
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from POS.app_logging import AppLogging, JsonFormatter, LogQueueHandler, SizedTimedRotatingFileHandler, sampled_debug
+
+from POS.tests.base.base_test_case import BaseTestCase
+
+
+class TestAppLogging(BaseTestCase):
+    def setUp(self):
+        BaseTestCase.confirm_app_in_testing_mode()
+
+        from POS import app
+        self.app = app
+        self.log_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.log_dir)
+
+    def test_json_formatter(self):
+        try:
+            raise ValueError("bad value")
+        except ValueError:
+            record = logging.LogRecord("POS", logging.ERROR, __file__, 1, "Sale %s failed", (4,), sys.exc_info())
+
+        log_entry = json.loads(JsonFormatter().format(record))
+
+        self.assertEqual(log_entry["level"], "ERROR")
+        self.assertEqual(log_entry["logger"], "POS")
+        self.assertEqual(log_entry["message"], "Sale 4 failed")
+        self.assertIn("ValueError: bad value", log_entry["exception"])
+
+    def test_queued_record_keeps_traceback(self):
+        try:
+            raise ValueError("bad value")
+        except ValueError:
+            record = logging.LogRecord("POS", logging.ERROR, __file__, 1, "Sale %s failed", (4,), sys.exc_info())
+
+        queued_record = LogQueueHandler(mock.Mock()).prepare(record)
+
+        self.assertEqual(queued_record.msg, "Sale 4 failed")
+        self.assertIsNone(queued_record.exc_info)
+        self.assertIn("bad value", json.loads(JsonFormatter().format(queued_record))["exception"])
+
+    def test_file_is_rotated_by_size(self):
+        log_file = os.path.join(self.log_dir, "app.log")
+        handler = SizedTimedRotatingFileHandler(log_file, max_bytes=300, when="midnight", backupCount=10)
+        handler.setFormatter(JsonFormatter())
+
+        logger = logging.getLogger("POS.tests.rotation")
+        logger.propagate = False
+        logger.addHandler(handler)
+        try:
+            for num in range(10):
+                logger.warning("Log line number %d", num)
+        finally:
+            logger.removeHandler(handler)
+            handler.close()
+
+        log_files = os.listdir(self.log_dir)
+        # Rollovers within the same day get distinct names instead of overwriting each other
+        self.assertGreater(len(log_files), 2)
+
+        lines = []
+        for file_name in log_files:
+            with open(os.path.join(self.log_dir, file_name)) as log:
+                lines.extend(json.loads(line)["message"] for line in log)
+            self.assertLessEqual(os.path.getsize(os.path.join(self.log_dir, file_name)), 300)
+        self.assertEqual(sorted(lines), sorted("Log line number %d" % num for num in range(10)))
+
+    def test_app_logs_go_through_the_queue(self):
+        self.assertIsNotNone(AppLogging.listener)
+        self.assertTrue(any(isinstance(handler, LogQueueHandler) for handler in logging.getLogger().handlers))
+        self.assertFalse(any(isinstance(handler, logging.StreamHandler) for handler in self.app.logger.handlers))
+
+    def test_sampled_debug(self):
+        with self.app.app_context(), \
+                mock.patch.object(self.app.logger, "isEnabledFor", return_value=True), \
+                mock.patch.object(self.app.logger, "debug") as debug:
+            self.app.config["DEBUG_LOG_SAMPLE_RATE"] = 0
+            sampled_debug("Sales request: %s", dict(line_items=[]))
+            debug.assert_not_called()
+
+            self.app.config["DEBUG_LOG_SAMPLE_RATE"] = 1
+            try:
+                sampled_debug("Sales request: %s", dict(line_items=[]))
+            finally:
+                self.app.config["DEBUG_LOG_SAMPLE_RATE"] = 0.01
+            debug.assert_called_once_with("Sales request: %s", dict(line_items=[]))
+
+
+if __name__ == "__main__":
+    unittest.main()
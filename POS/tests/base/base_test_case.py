@@ -1,11 +1,26 @@
+import contextlib
 import os
 import sys
 import unittest
 import json
+from collections import namedtuple
 
+from flask import g, request, has_request_context
+from sqlalchemy import event
+
+from POS.instrumentation import request_measured
 from POS.models.base_model import AppDB
+from POS.models.redis_store import AppRedis
+
+from POS.constants import APP_CONFIG_ENV_VAR, TESTING_CONFIG_VAR, TESTING_DATABASE_URL, \
+    ADMIN_ROLE_NAME, CASHIER_ROLE_NAME
+from POS.models.user_management.business import Business
+from POS.tests.base.factories import Factories
+from POS.tests.base.isolated_database import IsolatedDatabase
+from POS.tests.base.request_budgets import REQUEST_BUDGETS, LATENCY_BUDGET_FACTOR
 
-from POS.constants import APP_CONFIG_ENV_VAR, TESTING_CONFIG_VAR, TESTING_DATABASE_URL
+# SQL statements run and wall time of a request checked against its budget
+MeasuredRequest = namedtuple("MeasuredRequest", ("sql_count", "wall_seconds"))
 
 
 class BaseTestCase(unittest.TestCase):
@@ -46,22 +61,12 @@ class BaseTestCase(unittest.TestCase):
         self.owner_email = "owner@gmail.com"
         self.owner_password = "owner_pw"
 
-        self.signup(
-            name=self.owner_name,
-            email=self.owner_email,
-            password=self.owner_password
-        )
+        owner = Factories.create_user(self.owner_name, self.owner_email, self.owner_password)
 
         # Create business which associates this user with business
         # making him/her the owner
-        self.create_business()
-
-        with self.test_app as c:
-            with c.session_transaction() as sess:
-                self.business_id = sess["business_id"]
-
-        # logout as owner
-        self.logout()
+        self.business_name = "test_business"
+        self.business_id = Factories.create_business(owner, name=self.business_name).id
 
     def create_business(self):
         """
@@ -82,32 +87,7 @@ class BaseTestCase(unittest.TestCase):
         self.admin_email = "admin@gmail.com"
         self.admin_password = "admin_pw"
 
-        self.signup(
-            name=self.admin_name,
-            email=self.admin_email,
-            password=self.admin_password
-        )
-
-        # logout as potential admin
-        self.logout()
-
-        # Login as owner
-        self.login(
-            email=self.owner_email,
-            password=self.owner_password
-        )
-
-        # Associate owner with business
-        self.select_business(self.business_id)
-
-        # Set the admin user as 'admin'
-        self.add_user_role(
-            role_name="admin",
-            email=self.admin_email
-        )
-
-        # Logout as owner
-        self.logout()
+        self.add_business_user(self.admin_name, self.admin_email, self.admin_password, ADMIN_ROLE_NAME)
 
     def create_cashier(self):
         # Create user
@@ -115,32 +95,20 @@ class BaseTestCase(unittest.TestCase):
         self.cashier_email = "cashier@gmail.com"
         self.cashier_password = "cashier_pw"
 
-        self.signup(
-            name=self.cashier_name,
-            email=self.cashier_email,
-            password=self.cashier_password
-        )
-
-        # logout as potential cashier
-        self.logout()
-
-        # Login as owner
-        self.login(
-            email=self.owner_email,
-            password=self.owner_password
-        )
+        self.add_business_user(self.cashier_name, self.cashier_email, self.cashier_password, CASHIER_ROLE_NAME)
 
-        # Associate owner with business
-        self.select_business(self.business_id)
-
-        # Set the user as 'admin'
-        self.add_user_role(
-            role_name="cashier",
-            email=self.cashier_email
+    def add_business_user(self, name, email, password, role_name):
+        """
+            Creates a user with the role in the test business
+        :return: User
+        """
+        user = Factories.create_user(name, email, password)
+        Factories.add_user_to_business(
+            user,
+            AppDB.db_session.query(Business).get(self.business_id),
+            role_name
         )
-
-        # Logout as owner
-        self.logout()
+        return user
 
     def login_as_admin(self):
         # Login as an admin
@@ -164,7 +132,7 @@ class BaseTestCase(unittest.TestCase):
     def init_test_app(self):
         """
             Create the application test client
-            and set up the database
+            and isolate the test in a database transaction
             :return:
         """
         BaseTestCase.confirm_app_in_testing_mode()
@@ -174,26 +142,79 @@ class BaseTestCase(unittest.TestCase):
         app.config["JSONIFY_PRETTYPRINT_REGULAR"] = False
         self.test_app = app.test_client()
 
-        # Initialize the database
-        BaseTestCase.init_test_db()
+        self.init_test_db()
 
     def tearDown(self):
         self.logout()
-        AppDB.db_session.commit()
-        AppDB.BaseModel.metadata.drop_all()
+        self.test_db.rollback()
 
-    @staticmethod
-    def init_test_db():
+    def init_test_db(self):
         """
-            Initialize the test database
+            Runs the test in a transaction rolled back by tearDown
+            (see POS.tests.base.isolated_database)
             :return:
         """
-        AppDB.db_session.commit()
-        AppDB.BaseModel.metadata.drop_all()
-        AppDB.BaseModel.metadata.create_all()
+        self.test_db = IsolatedDatabase(AppDB.db_engine)
+        self.test_db.begin()
+
+        BaseTestCase.clear_redis_cache()
 
-        from POS.models.user_management.role import Role
-        AppDB.load_default_roles(Role)
+    @staticmethod
+    def clear_redis_cache():
+        """
+            Remove data cached in Redis by previous tests (e.g. user principals),
+            since the recreated tables reuse the same ids
+            :return:
+        """
+        redis_db = AppRedis.get_client()
+        for key in redis_db.scan_iter(AppRedis.key("*")):
+            redis_db.delete(key)
+
+    @contextlib.contextmanager
+    def assert_request_budget(self, method, endpoint):
+        """
+            Fails the test if a request to the endpoint made within the block runs more SQL
+            statements or takes longer than its budget in REQUEST_BUDGETS
+            :param method: HTTP method e.g. "POST"
+            :param endpoint: Flask endpoint e.g. "sales_bp.sales"
+            :return: list of the MeasuredRequest of the matching requests
+        """
+        budget = REQUEST_BUDGETS[(method, endpoint)]
+        measured = []
+
+        def count_savepoint_statements(conn, cursor, statement, parameters, context, executemany):
+            if has_request_context() and IsolatedDatabase.is_savepoint_statement(statement):
+                g.savepoint_statements = g.get("savepoint_statements", 0) + 1
+
+        def record(sender, response, metrics, **extra):
+            if request.method == method and request.endpoint == endpoint:
+                measured.append(MeasuredRequest(
+                    sql_count=metrics.sql_count - g.get("savepoint_statements", 0),
+                    wall_seconds=metrics.wall_seconds
+                ))
+
+        event.listen(AppDB.db_engine, "before_cursor_execute", count_savepoint_statements)
+        request_measured.connect(record)
+        try:
+            yield measured
+        finally:
+            request_measured.disconnect(record)
+            event.remove(AppDB.db_engine, "before_cursor_execute", count_savepoint_statements)
+
+        self.assertTrue(measured, "No %s request to %s was made" % (method, endpoint))
+        for metrics in measured:
+            self.assertLessEqual(
+                metrics.sql_count,
+                budget.max_queries,
+                "%s %s ran %d SQL statements, its budget is %d" % (
+                    method, endpoint, metrics.sql_count, budget.max_queries)
+            )
+            self.assertLessEqual(
+                metrics.wall_seconds,
+                budget.max_seconds * LATENCY_BUDGET_FACTOR,
+                "%s %s took %.3f s, its budget is %.3f s" % (
+                    method, endpoint, metrics.wall_seconds, budget.max_seconds * LATENCY_BUDGET_FACTOR)
+            )
 
     def signup(self, name, email, password):
         """
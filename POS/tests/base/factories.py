@@ -0,0 +1,132 @@
+"""
+    Factories inserting test users, businesses and products straight into the database,
+    much faster than signing users up and creating businesses through the HTTP flows
+"""
+
+import itertools
+
+from POS.constants import OWNER_ROLE_NAME
+from POS.models.base_model import AppDB
+from POS.models.billing.ewallet import EWallet
+from POS.models.stock_management.product import Product
+from POS.models.user_management.business import Business
+from POS.models.user_management.password_hasher import PasswordHasher
+from POS.models.user_management.role import Role
+from POS.models.user_management.user import User
+from POS.models.user_management.user_business import UserBusiness
+
+DEFAULT_PASSWORD = "lipaless_pw"
+
+
+class Factories(object):
+    # Numbers the generated names and emails so they stay unique
+    sequence = itertools.count(1)
+    # Hashing is slow by design, hash each test password once
+    password_hashes = {}
+
+    @staticmethod
+    def password_hash(password):
+        if password not in Factories.password_hashes:
+            Factories.password_hashes[password] = PasswordHasher.hash_password(password)
+        return Factories.password_hashes[password]
+
+    @staticmethod
+    def create_users(count, password=DEFAULT_PASSWORD):
+        """
+            Inserts users with generated names and emails in bulk
+        :param count: Number of users
+        :param password: Password of every user
+        :return: list of User
+        """
+        users = []
+        for _ in range(count):
+            num = next(Factories.sequence)
+            users.append(dict(
+                name="user %d" % num,
+                email="user_%d@example.com" % num,
+                password=Factories.password_hash(password)
+            ))
+
+        AppDB.db_session.bulk_insert_mappings(User, users, return_defaults=True)
+        AppDB.db_session.commit()
+
+        return AppDB.db_session.query(User).filter(
+            User.emp_id.in_([user["emp_id"] for user in users])
+        ).order_by(User.emp_id).all()
+
+    @staticmethod
+    def create_user(name, email, password=DEFAULT_PASSWORD):
+        AppDB.db_session.bulk_insert_mappings(User, [dict(
+            name=name,
+            email=email,
+            password=Factories.password_hash(password)
+        )])
+        AppDB.db_session.commit()
+
+        return AppDB.db_session.query(User).filter(User.email == email).one()
+
+    @staticmethod
+    def create_business(owner, name=None, balance=None):
+        """
+            Creates a business owned by the user, with its e-wallet
+        :param owner: User
+        :param name: Business name, generated when not given
+        :param balance: E-wallet balance, the default balance of new businesses when not given
+        :return: Business
+        """
+        business = Business(
+            name=name or "business %d" % next(Factories.sequence),
+            contact_no="0712345678"
+        )
+
+        ewallet = EWallet() if balance is None else EWallet(balance=balance)
+        ewallet.business = business
+
+        AppDB.db_session.add(business)
+        Factories.add_user_to_business(owner, business, OWNER_ROLE_NAME)
+
+        return business
+
+    @staticmethod
+    def add_user_to_business(user, business, role_name, deactivated=False):
+        """
+            Gives the user a role in the business
+        :return: UserBusiness
+        """
+        user_business = UserBusiness(Role.get_role_id(role_name), is_deactivated=deactivated)
+        user_business.user = user
+        user_business.business = business
+
+        AppDB.db_session.add(user_business)
+        AppDB.db_session.commit()
+
+        return user_business
+
+    @staticmethod
+    def create_products(business, count, **fields):
+        """
+            Inserts products of the business in bulk
+        :param business: Business
+        :param count: Number of products
+        :param fields: Values of the product columns, replacing the defaults
+        :return: list of Product
+        """
+        products = []
+        for _ in range(count):
+            num = next(Factories.sequence)
+            products.append(dict(dict(
+                name="product %d" % num,
+                description=None,
+                buying_price=10,
+                selling_price=15,
+                reorder_level=5,
+                quantity=100,
+                business_id=business.id
+            ), **fields))
+
+        AppDB.db_session.bulk_insert_mappings(Product, products, return_defaults=True)
+        AppDB.db_session.commit()
+
+        return AppDB.db_session.query(Product).filter(
+            Product.id.in_([product["id"] for product in products])
+        ).order_by(Product.id).all()
@@ -0,0 +1,121 @@
+"""
+    Isolates the tests from each other with transactions instead of recreating the tables for every test.
+    A test runs in a transaction rolled back once it ends, and the app's session works in a SAVEPOINT
+    restarted after each of its commits and rollbacks, so the app code under test commits and rolls
+    back as usual without its changes outliving the test
+"""
+
+import re
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+
+from POS.models.base_model import AppDB
+
+
+class IsolatedDatabase(object):
+    # Engines whose tables (and default roles) were created by this process
+    initialized_engines = set()
+    sqlite_engine = None
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.connection = None
+        self.transaction = None
+
+    @staticmethod
+    def create_tables(engine):
+        """
+            Creates the tables and default roles once per process and engine, the data they hold
+            when a test starts is what the earlier tests of the process committed outside of transactions
+        :param engine:
+        :return:
+        """
+        if engine in IsolatedDatabase.initialized_engines:
+            return
+
+        from POS.models.user_management.role import Role
+
+        AppDB.db_session.commit()
+        AppDB.BaseModel.metadata.drop_all(engine)
+        AppDB.BaseModel.metadata.create_all(engine)
+
+        AppDB.db_session.bind = engine
+        try:
+            AppDB.load_default_roles(Role)
+        finally:
+            AppDB.db_session.close()
+            AppDB.db_session.bind = AppDB.db_engine
+
+        IsolatedDatabase.initialized_engines.add(engine)
+
+    @staticmethod
+    def get_sqlite_engine():
+        """
+            In-memory SQLite database shared by the model tests of this process
+        :return: Engine
+        """
+        if IsolatedDatabase.sqlite_engine is None:
+            engine = create_engine(
+                "sqlite://",
+                connect_args=dict(check_same_thread=False),
+                poolclass=StaticPool
+            )
+
+            # pysqlite starts its transactions itself, in a way that breaks SAVEPOINTs:
+            # leave the transactions to SQLAlchemy
+            @event.listens_for(engine, "connect")
+            def disable_pysqlite_transactions(dbapi_connection, connection_record):
+                dbapi_connection.isolation_level = None
+
+            @event.listens_for(engine, "begin")
+            def begin_transaction(conn):
+                conn.execute("BEGIN")
+
+            IsolatedDatabase.sqlite_engine = engine
+        return IsolatedDatabase.sqlite_engine
+
+    def begin(self):
+        """
+            Binds the app's session to a connection in a transaction, working in a SAVEPOINT
+        :return:
+        """
+        IsolatedDatabase.create_tables(self.engine)
+
+        self.connection = self.engine.connect()
+        self.transaction = self.connection.begin()
+
+        AppDB.db_session.close()
+        AppDB.db_session.bind = self.connection
+        AppDB.db_session.begin_nested()
+
+        event.listen(AppDB.db_session, "after_transaction_end", IsolatedDatabase.restart_savepoint)
+
+    @staticmethod
+    def is_savepoint_statement(statement):
+        """
+            Tells the statements managing the SAVEPOINTs of the tests, which the app doesn't run in production
+        :param statement: SQL statement
+        :return: bool
+        """
+        return re.match(r"(RELEASE |ROLLBACK TO )?SAVEPOINT ", statement) is not None
+
+    @staticmethod
+    def restart_savepoint(session, transaction):
+        # The app committed or rolled back the SAVEPOINT, start the next one
+        if transaction.nested and not transaction._parent.nested:
+            session.expire_all()
+            session.begin_nested()
+
+    def rollback(self):
+        """
+            Discards everything the test wrote and binds the app's session back to the engine of the app
+        :return:
+        """
+        event.remove(AppDB.db_session, "after_transaction_end", IsolatedDatabase.restart_savepoint)
+
+        AppDB.db_session.close()
+        self.transaction.rollback()
+        self.connection.close()
+
+        AppDB.db_session.bind = AppDB.db_engine
@@ -0,0 +1,16 @@
+import unittest
+
+from POS.tests.base.isolated_database import IsolatedDatabase
+
+
+class ModelTestCase(unittest.TestCase):
+    """
+        Base of the tests of models which don't need the app or the testing Postgres database:
+        they run against an in-memory SQLite database, each in a transaction rolled back afterwards
+    """
+    def setUp(self):
+        self.test_db = IsolatedDatabase(IsolatedDatabase.get_sqlite_engine())
+        self.test_db.begin()
+
+    def tearDown(self):
+        self.test_db.rollback()
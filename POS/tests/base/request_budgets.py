@@ -0,0 +1,25 @@
+"""
+    SQL statement and latency budgets of the endpoints, checked by BaseTestCase.assert_request_budget.
+    A budget should only be raised together with the change that needs it
+"""
+
+import os
+from collections import namedtuple
+
+from POS.constants import APP_NAME
+
+RequestBudget = namedtuple("RequestBudget", ("max_queries", "max_seconds"))
+
+# Slow machines (e.g. shared CI runners) can scale the latency budgets up
+LATENCY_BUDGET_FACTOR = float(os.environ.get(APP_NAME + "_TEST_LATENCY_BUDGET_FACTOR", 1))
+
+# Budgets by (HTTP method, endpoint)
+REQUEST_BUDGETS = {
+    # Password hashing runs in a worker process
+    ("POST", "login_bp.login"): RequestBudget(max_queries=2, max_seconds=2.0),
+    ("GET", "business_bp.business"): RequestBudget(max_queries=1, max_seconds=0.5),
+    ("GET", "business_bp.select_business"): RequestBudget(max_queries=5, max_seconds=0.5),
+    ("GET", "products_bp.products"): RequestBudget(max_queries=3, max_seconds=0.5),
+    # Whatever the number of line items in the cart
+    ("POST", "sales_bp.sales"): RequestBudget(max_queries=6, max_seconds=0.5),
+}
@@ -0,0 +1,55 @@
+import unittest
+
+from POS.constants import CASHIER_ROLE_NAME, OWNER_ROLE_NAME
+from POS.models.base_model import AppDB
+from POS.models.stock_management.category import Category
+from POS.models.stock_management.product import Product
+from POS.models.user_management.password_hasher import PasswordHasher
+from POS.models.user_management.role import Role
+from POS.models.user_management.user import User
+from POS.models.user_management.user_business import UserBusiness
+
+from POS.tests.base.factories import Factories, DEFAULT_PASSWORD
+from POS.tests.base.model_test_case import ModelTestCase
+
+
+class TestFactories(ModelTestCase):
+    def test_create_business_with_users_and_products(self):
+        owner, cashier = Factories.create_users(2)
+        self.assertTrue(PasswordHasher.check_password(owner.password, DEFAULT_PASSWORD))
+
+        business = Factories.create_business(owner)
+        Factories.add_user_to_business(cashier, business, CASHIER_ROLE_NAME)
+
+        roles = dict(AppDB.db_session.query(UserBusiness.emp_id, Role.name).join(Role).filter(
+            UserBusiness.business_id == business.id
+        ).all())
+        self.assertEqual(roles, {owner.emp_id: OWNER_ROLE_NAME, cashier.emp_id: CASHIER_ROLE_NAME})
+        self.assertEqual(len(business.ewallet), 1)
+
+        products = Factories.create_products(business, 50, quantity=7)
+        self.assertEqual(len(products), 50)
+        self.assertTrue(all(product.quantity == 7 and product.business_id == business.id for product in products))
+
+    def test_category_name(self):
+        business = Factories.create_business(Factories.create_users(1)[0])
+
+        category = Category("drinks", "cold drinks")
+        category.business_id = business.id
+        AppDB.db_session.add(category)
+        AppDB.db_session.commit()
+
+        self.assertEqual(Category.get_category_name(category.id), "drinks")
+        self.assertIsNone(Category.get_category_name(None))
+
+    def test_tests_are_isolated(self):
+        # Whatever the order of the tests, the ones before committed nothing
+        self.assertEqual(AppDB.db_session.query(User).count(), 0)
+        self.assertEqual(AppDB.db_session.query(Product).count(), 0)
+
+        Factories.create_users(1)
+        self.assertEqual(AppDB.db_session.query(User).count(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
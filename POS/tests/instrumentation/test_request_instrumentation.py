@@ -0,0 +1,54 @@
+import unittest
+
+from POS.instrumentation import RequestInstrumentation
+
+from POS.tests.base.base_test_case import BaseTestCase
+
+
+class TestRequestInstrumentation(BaseTestCase):
+    def setUp(self):
+        self.init_test_app()
+
+        from POS import app
+        self.app = app
+
+        self.signup(
+            name="lipaless guy",
+            email="lipaless_guy@gmail.com",
+            password="lipaless_pw"
+        )
+
+    def endpoint_stats(self, endpoint):
+        return RequestInstrumentation.stats().get(endpoint, dict(count=0, sql_count=0, redis_calls=0))
+
+    def test_request_is_measured(self):
+        before = self.endpoint_stats("business_bp.business")
+
+        rv = self.test_app.get("/business")
+        self.assertIn("200", rv.status)
+
+        after = self.endpoint_stats("business_bp.business")
+        self.assertEqual(after["count"], before["count"] + 1)
+        # The businesses of the user are queried and the session is loaded from Redis
+        self.assertGreater(after["sql_count"], before["sql_count"])
+        self.assertGreater(after["redis_calls"], before["redis_calls"])
+        self.assertEqual(sum(after["latency_buckets"].values()), after["count"])
+
+        # Server-Timing is only sent in debug mode
+        self.assertNotIn("Server-Timing", rv.headers)
+
+    def test_server_timing_in_debug_mode(self):
+        self.app.debug = True
+        try:
+            rv = self.test_app.get("/business")
+        finally:
+            self.app.debug = False
+
+        server_timing = rv.headers["Server-Timing"]
+        self.assertIn("app;dur=", server_timing)
+        self.assertIn("db;dur=", server_timing)
+        self.assertIn("redis;dur=", server_timing)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+from POS.slow_query_log import SlowQueryLog, slow_queries_command
+
+from POS.tests.base.base_test_case import BaseTestCase
+
+
+class TestSlowQueryLog(BaseTestCase):
+    def setUp(self):
+        self.init_test_app()
+
+        from POS import app
+        self.app = app
+        self.default_threshold = app.config["SLOW_QUERY_THRESHOLD_MS"]
+
+        self.signup(
+            name="lipaless guy",
+            email="lipaless_guy@gmail.com",
+            password="lipaless_pw"
+        )
+
+    def tearDown(self):
+        self.app.config["SLOW_QUERY_THRESHOLD_MS"] = self.default_threshold
+        super(TestSlowQueryLog, self).tearDown()
+
+    def test_slow_queries_are_recorded(self):
+        # Consider every statement slow
+        self.app.config["SLOW_QUERY_THRESHOLD_MS"] = 0
+
+        self.test_app.get("/business")
+        self.test_app.get("/business")
+
+        self.app.config["SLOW_QUERY_THRESHOLD_MS"] = self.default_threshold
+
+        offenders = SlowQueryLog.top_offenders(limit=50)
+        business_offenders = [offender for offender in offenders if offender["last_endpoint"] == "business_bp.business"]
+        self.assertTrue(business_offenders)
+
+        select = [offender for offender in business_offenders if offender["statement"].startswith("SELECT")][0]
+        self.assertEqual(select["count"], 2)
+        self.assertIn("actual time", select["explain"])
+
+        result = self.app.test_cli_runner().invoke(slow_queries_command, ["--limit", "3", "--explain"])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("runs", result.output)
+
+    def test_fast_queries_are_not_recorded(self):
+        self.test_app.get("/business")
+
+        self.assertEqual(SlowQueryLog.top_offenders(limit=10), [])
+
+    def test_statement_shape(self):
+        self.assertEqual(
+            SlowQueryLog.parameter_shape({"emp_id_1": 4, "email_1": "a@gmail.com"}, False),
+            "{email_1: str, emp_id_1: int}"
+        )
+        self.assertEqual(SlowQueryLog.parameter_shape([{"id": 1}, {"id": 2}], True), "{id: int} x 2")
+
+        self.assertTrue(SlowQueryLog.is_explainable("SELECT product.id FROM product"))
+        self.assertFalse(SlowQueryLog.is_explainable("SELECT product.id FROM product FOR UPDATE"))
+        self.assertFalse(SlowQueryLog.is_explainable("UPDATE product SET quantity = 1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
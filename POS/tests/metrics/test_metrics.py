@@ -0,0 +1,51 @@
+import unittest
+
+from POS.models.rate_limiter import RateLimiter
+
+from POS.tests.base.base_test_case import BaseTestCase
+
+
+class TestMetrics(BaseTestCase):
+    def setUp(self):
+        self.init_test_app()
+
+        from POS import app
+        self.app = app
+
+        self.signup(
+            name="lipaless guy",
+            email="lipaless_guy@gmail.com",
+            password="lipaless_pw"
+        )
+
+    def test_metrics(self):
+        self.test_app.get("/business")
+        RateLimiter.consume(scope="login", identities=dict(ip="10.0.0.1"), capacity=1, refill_per_second=1)
+
+        rv = self.test_app.get("/metrics")
+
+        self.assertEqual(rv.status_code, 200)
+        self.assertIn("text/plain", rv.headers["Content-Type"])
+
+        metrics = rv.data.decode("utf-8")
+        self.assertIn('lipaless_request_duration_seconds_count{blueprint="business_bp",method="GET",status="200"}',
+                      metrics)
+        self.assertIn('lipaless_request_sql_statements_total{blueprint="business_bp"}', metrics)
+        self.assertIn("lipaless_db_pool_checked_out_connections", metrics)
+        self.assertIn('lipaless_redis_pool_connections{state="in_use"}', metrics)
+        self.assertIn('lipaless_rate_limited_requests_total{result="allowed",scope="login"} 1.0', metrics)
+
+    def test_metrics_auth_token(self):
+        self.app.config["METRICS_AUTH_TOKEN"] = "scraper_token"
+        try:
+            rv = self.test_app.get("/metrics")
+            self.assertEqual(rv.status_code, 403)
+
+            rv = self.test_app.get("/metrics", headers=dict(Authorization="Bearer scraper_token"))
+            self.assertEqual(rv.status_code, 200)
+        finally:
+            self.app.config["METRICS_AUTH_TOKEN"] = None
+
+
+if __name__ == "__main__":
+    unittest.main()
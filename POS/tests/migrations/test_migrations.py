@@ -0,0 +1,69 @@
+import unittest
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine
+
+from POS.migrations import AppMigrations, INITIAL_REVISION
+from POS.models.base_model import AppDB
+
+from POS.tests.base.base_test_case import BaseTestCase
+
+
+class TestMigrations(BaseTestCase):
+    def setUp(self):
+        self.confirm_app_in_testing_mode()
+
+        from POS import app
+
+        # Migrate a schema of their own, next to the one of the other tests
+        self.schema = "%s_migrations" % (app.config["SQLALCHEMY_DATABASE_SCHEMA"] or "test")
+        AppDB.db_engine.execute('DROP SCHEMA IF EXISTS "%s" CASCADE' % self.schema)
+        AppDB.db_engine.execute('CREATE SCHEMA "%s"' % self.schema)
+
+        self.engine = create_engine(
+            app.config["SQLALCHEMY_DATABASE_URI"],
+            connect_args=dict(options="-csearch_path=%s" % self.schema)
+        )
+
+    def tearDown(self):
+        self.engine.dispose()
+        AppDB.db_engine.execute('DROP SCHEMA IF EXISTS "%s" CASCADE' % self.schema)
+
+    def current_revision(self):
+        with self.engine.connect() as connection:
+            return MigrationContext.configure(connection).get_current_revision()
+
+    def schema_differences(self):
+        with self.engine.connect() as connection:
+            return compare_metadata(MigrationContext.configure(connection), AppDB.BaseModel.metadata)
+
+    def test_migrations_create_the_schema_of_the_models(self):
+        AppMigrations.upgrade(self.engine)
+
+        self.assertEqual(self.schema_differences(), [])
+
+    def test_migrations_downgrade(self):
+        AppMigrations.upgrade(self.engine)
+        AppMigrations.run(self.engine, command.downgrade, "base")
+
+        self.assertEqual(self.engine.table_names(), ["alembic_version"])
+        self.assertIsNone(self.current_revision())
+
+    def test_tables_created_before_the_migrations_are_upgraded(self):
+        # The tables of the initial revision, without the alembic_version table
+        AppMigrations.upgrade(self.engine, INITIAL_REVISION)
+        self.engine.execute("DROP TABLE alembic_version")
+
+        AppMigrations.upgrade(self.engine)
+
+        with self.engine.connect() as connection:
+            head = ScriptDirectory.from_config(AppMigrations.get_config(connection)).get_current_head()
+        self.assertEqual(self.current_revision(), head)
+        self.assertEqual(self.schema_differences(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
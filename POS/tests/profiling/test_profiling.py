@@ -0,0 +1,94 @@
+import json
+import marshal
+import threading
+import unittest
+
+from POS.profiling import PROFILE_ID_HEADER, SamplingProfiler
+
+from POS.tests.base.base_test_case import BaseTestCase
+
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(100))
+
+
+class TestProfiling(BaseTestCase):
+    def setUp(self):
+        self.init_test_app()
+        self.create_owner()
+
+    def login_as_owner(self):
+        self.login(self.owner_email, self.owner_password)
+        self.select_business(self.business_id)
+
+    def test_admin_profiles_request(self):
+        self.login_as_owner()
+
+        rv = self.test_app.get("/business", headers={"X-Profile": "1"})
+        self.assertIn(PROFILE_ID_HEADER, rv.headers)
+        profile_id = rv.headers[PROFILE_ID_HEADER]
+
+        rv = self.test_app.get("/profiling/requests/%s" % profile_id)
+        self.assertIn("text/plain", rv.headers["Content-Type"])
+        self.assertIn(b"function calls", rv.data)
+
+        rv = self.test_app.get("/profiling/requests/%s?format=pstats" % profile_id)
+        self.assertTrue(marshal.loads(rv.data))
+
+        rv = self.test_app.get("/profiling/requests/expired")
+        self.assertEqual(rv.headers["code"], "404")
+
+    def test_requests_are_not_profiled_without_header_or_role(self):
+        self.login_as_owner()
+        rv = self.test_app.get("/business")
+        self.assertNotIn(PROFILE_ID_HEADER, rv.headers)
+        self.logout()
+
+        # Without a selected business the user has no role
+        self.login(self.owner_email, self.owner_password)
+        rv = self.test_app.get("/business", headers={"X-Profile": "1"})
+        self.assertNotIn(PROFILE_ID_HEADER, rv.headers)
+
+        # Nor can they read profiles
+        rv = self.test_app.get("/profiling/requests/any")
+        self.assertEqual(rv.status_code, 303)
+
+    def test_sampling_profiler_collapses_stacks(self):
+        stop = threading.Event()
+        busy_thread = threading.Thread(target=busy_loop, args=(stop,), name="busy")
+        busy_thread.start()
+        try:
+            profiler = SamplingProfiler(seconds=0.2, interval=0.005).run()
+        finally:
+            stop.set()
+            busy_thread.join()
+
+        self.assertGreater(profiler.sample_count, 1)
+
+        busy_stacks = [
+            line for line in profiler.collapsed_stacks().splitlines() if line.startswith("busy;")
+        ]
+        self.assertTrue(busy_stacks)
+        stack, count = busy_stacks[0].rsplit(" ", 1)
+        self.assertIn("busy_loop (test_profiling.py:", stack)
+        self.assertGreater(int(count), 0)
+
+    def test_sample_worker(self):
+        self.login_as_owner()
+
+        rv = self.test_app.post("/profiling/samples?seconds=0.1")
+        self.assertEqual(rv.headers["code"], "202")
+        sample_id = json.loads(rv.data.decode("utf-8"))["sample_id"]
+
+        # The sampling thread holds the lock until its result is stored
+        with SamplingProfiler.lock:
+            pass
+
+        rv = self.test_app.get("/profiling/samples/%s" % sample_id)
+        self.assertIn("text/plain", rv.headers["Content-Type"])
+        self.assertIn(b"MainThread;", rv.data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+from POS.models.redis_store import AppRedis
+from POS.constants import REDIS_KEY_PREFIX
+
+from POS.tests.base.base_test_case import BaseTestCase
+
+
+class TestAppRedis(BaseTestCase):
+    def setUp(self):
+        self.init_test_app()
+
+    def test_key(self):
+        self.assertEqual(AppRedis.key("user", 4), "%s:user:4" % REDIS_KEY_PREFIX)
+
+    def test_client_is_shared(self):
+        self.assertIs(AppRedis.get_client(), AppRedis.get_client())
+
+        from POS import app
+        self.assertIs(app.config["SESSION_REDIS"], AppRedis.get_client())
+
+    def test_pool_stats(self):
+        AppRedis.get_client().ping()
+
+        stats = AppRedis.pool_stats()
+        self.assertGreaterEqual(stats["created"], 1)
+        self.assertEqual(stats["in_use"], 0)
+        self.assertEqual(stats["created"], stats["in_use"] + stats["idle"])
+
+        # A checked out connection is reported as in use until it is released
+        connection = AppRedis.connection_pool.get_connection("PING")
+        try:
+            self.assertEqual(AppRedis.pool_stats()["in_use"], 1)
+        finally:
+            AppRedis.connection_pool.release(connection)
+
+        self.assertEqual(AppRedis.pool_stats()["in_use"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import json
+import unittest
+
+from POS.models.base_model import AppDB
+from POS.models.sales.line_item import LineItem
+from POS.models.stock_management.product import Product
+
+from POS.tests.base.base_test_case import BaseTestCase
+
+PRODUCT_QUANTITY = 100
+
+
+class TestRequestBudgets(BaseTestCase):
+    def setUp(self):
+        self.init_test_app()
+        self.create_owner()
+
+        self.products = []
+        for num in range(20):
+            product = Product(
+                name="product %d" % num,
+                description=None,
+                buying_price=10,
+                selling_price=15,
+                reorder_level=5,
+                quantity=PRODUCT_QUANTITY
+            )
+            product.business_id = self.business_id
+            self.products.append(product)
+        AppDB.db_session.add_all(self.products)
+        AppDB.db_session.commit()
+
+    def log_in_owner(self):
+        with self.assert_request_budget("POST", "login_bp.login"):
+            self.login(self.owner_email, self.owner_password)
+
+        with self.assert_request_budget("GET", "business_bp.select_business"):
+            self.select_business(self.business_id)
+
+    def check_out(self, products, quantity=2):
+        return self.send_json_post(
+            "/sales",
+            transaction=dict(amount_given=1000),
+            line_items=[dict(
+                product_id=product.id,
+                name=product.name,
+                selling_price=product.selling_price,
+                quantity=quantity
+            ) for product in products]
+        )
+
+    def test_browsing_budgets(self):
+        self.log_in_owner()
+
+        with self.assert_request_budget("GET", "business_bp.business"):
+            self.test_app.get("/business")
+
+        with self.assert_request_budget("GET", "products_bp.products"):
+            rv = self.test_app.get("/products")
+
+        products = json.loads(rv.data.decode("utf-8"))["msg"]["products"]
+        self.assertEqual(len(products), len(self.products))
+
+    def test_checkout_budget_does_not_grow_with_the_cart(self):
+        self.log_in_owner()
+
+        with self.assert_request_budget("POST", "sales_bp.sales") as measured:
+            self.check_out(self.products[:1])
+            self.check_out(self.products)
+
+        self.assertEqual(measured[0].sql_count, measured[1].sql_count)
+
+        self.assertEqual(AppDB.db_session.query(LineItem).count(), 21)
+        AppDB.db_session.expire_all()
+        self.assertEqual(AppDB.db_session.query(Product).get(self.products[0].id).quantity, PRODUCT_QUANTITY - 4)
+        self.assertEqual(AppDB.db_session.query(Product).get(self.products[1].id).quantity, PRODUCT_QUANTITY - 2)
+
+    def test_products_of_other_businesses_are_not_sold(self):
+        other_product = Product(
+            name="other product",
+            description=None,
+            buying_price=10,
+            selling_price=15,
+            reorder_level=5,
+            quantity=PRODUCT_QUANTITY
+        )
+        AppDB.db_session.add(other_product)
+        AppDB.db_session.commit()
+
+        self.log_in_owner()
+        self.check_out([self.products[0], other_product])
+
+        self.assertEqual(AppDB.db_session.query(LineItem.product_id).all(), [(self.products[0].id,)])
+        AppDB.db_session.expire_all()
+        self.assertEqual(AppDB.db_session.query(Product).get(other_product.id).quantity, PRODUCT_QUANTITY)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from unittest import mock
+
+from POS.models.redis_store import AppRedis
+from POS.sessions import CompactSessionCodec
+from POS.tests.base.base_test_case import BaseTestCase
+
+
+class TestCompactSessions(BaseTestCase):
+    def setUp(self):
+        self.init_test_app()
+
+        from POS import app
+        self.app = app
+
+    def test_codec_round_trip(self):
+        session_data = {
+            "_user_id": 4,
+            "_fresh": True,
+            "_id": "ab" * 64,
+            "business_id": 7,
+            "business_name": "mandazi poa",
+            "role": "owner",
+            "billing_job_id": "0b5a5f6e-58f4-4b8e-9a43-6f1b1d2a2c11",
+            "not_aliased": "kept as is"
+        }
+
+        encoded = CompactSessionCodec.dumps(session_data)
+
+        self.assertTrue(encoded.startswith(CompactSessionCodec.MSGPACK_MARKER))
+        self.assertEqual(CompactSessionCodec.loads(encoded), session_data)
+
+    def test_codec_falls_back_to_pickle(self):
+        session_data = {"_id": "not hex", "business_id": 7}
+
+        encoded = CompactSessionCodec.dumps(session_data)
+
+        self.assertTrue(encoded.startswith(CompactSessionCodec.PICKLE_MARKER))
+        self.assertEqual(CompactSessionCodec.loads(encoded), session_data)
+
+    def test_read_only_request_does_not_rewrite_session(self):
+        rv = self.signup(
+            name="lipaless guy",
+            email="lipaless_guy@gmail.com",
+            password="lipaless_pw"
+        )
+
+        # Find the session the signup stored and shorten its expiry
+        session_id = rv.headers["Set-Cookie"].split(";")[0].split("=", 1)[1]
+        session_key = self.app.config["SESSION_KEY_PREFIX"] + session_id
+
+        redis_db = AppRedis.get_client()
+        redis_db.expire(session_key, 1000)
+
+        # A read only request must not rewrite the session, only slide its expiry
+        with mock.patch.object(redis_db, "setex", wraps=redis_db.setex) as setex:
+            rv = self.test_app.get("/business")
+
+        self.assertIn("200", rv.status)
+        self.assertNotIn(session_key, [call[1].get("name") for call in setex.call_args_list])
+        self.assertGreater(redis_db.ttl(session_key), 1000)
+        self.assertNotIn("Set-Cookie", rv.headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
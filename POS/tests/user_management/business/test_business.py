@@ -9,19 +9,7 @@ from POS.tests.base.base_test_case import BaseTestCase
 
 class TestBusiness(BaseTestCase):
     def setUp(self):
-        TestBusiness.confirm_app_in_testing_mode()
-
-        from POS import app
-        app.testing = True
-        app.config["JSONIFY_PRETTYPRINT_REGULAR"] = False
-        self.test_app = app.test_client()
-
-        AppDB.db_session.commit()
-        AppDB.BaseModel.metadata.drop_all()
-        AppDB.BaseModel.metadata.create_all()
-
-        from POS.models.user_management.role import Role
-        AppDB.load_default_roles(Role)
+        self.init_test_app()
 
         # Business details
         self.test_business_name = "mandazi poa"
@@ -57,11 +45,6 @@ class TestBusiness(BaseTestCase):
         # Logout as user 2
         self.logout()
 
-    def tearDown(self):
-        self.logout()
-        AppDB.db_session.commit()
-        AppDB.BaseModel.metadata.drop_all()
-
     def test_get(self):
         self.login(self.user_1_email, self.user_1_password)
 
@@ -7,20 +7,7 @@ from POS.tests.base.base_test_case import BaseTestCase
 
 class TestLogin(BaseTestCase):
     def setUp(self):
-        TestLogin.confirm_app_in_testing_mode()
-
-        from POS import app
-        app.testing = True
-        app.config["JSONIFY_PRETTYPRINT_REGULAR"] = False
-        self.test_app = app.test_client()
-
-        AppDB.db_session.commit()
-        AppDB.BaseModel.metadata.drop_all()
-        AppDB.BaseModel.metadata.create_all()
-
-    def tearDown(self):
-        AppDB.db_session.commit()
-        AppDB.BaseModel.metadata.drop_all()
+        self.init_test_app()
 
     def test_get(self):
         rv = self.test_app.get("/login")
@@ -0,0 +1,71 @@
+import unittest
+from unittest import mock
+
+from werkzeug.security import generate_password_hash
+
+from POS.constants import PASSWORD_HASH_METHOD
+from POS.models.base_model import AppDB
+from POS.models.user_management.password_hasher import PasswordHasher, PasswordHashingBusy
+from POS.models.user_management.user import User
+
+from POS.tests.base.base_test_case import BaseTestCase
+
+OUTDATED_HASH_METHOD = "pbkdf2:sha256:1000"
+
+
+class TestPasswordHashing(BaseTestCase):
+    def setUp(self):
+        self.init_test_app()
+
+        self.email = "lipaless@gmail.com"
+        self.password = "lipaless_pw"
+
+        self.user = User(
+            name="lipaless",
+            email=self.email,
+            password=self.password
+        )
+        AppDB.db_session.add(self.user)
+        AppDB.db_session.commit()
+
+    def stored_password_hash(self):
+        # Read the hash from the database, not the one held by the session
+        return AppDB.db_session.execute(
+            User.__table__.select().where(User.emp_id == self.user.emp_id)
+        ).first()["password"]
+
+    def test_needs_rehash(self):
+        self.assertFalse(PasswordHasher.needs_rehash(PasswordHasher.hash_password(self.password)))
+        self.assertTrue(PasswordHasher.needs_rehash(generate_password_hash(self.password, OUTDATED_HASH_METHOD)))
+
+    def test_outdated_hash_is_upgraded_on_login(self):
+        self.user.password = generate_password_hash(self.password, OUTDATED_HASH_METHOD)
+        AppDB.db_session.commit()
+
+        rv = self.login(self.email, self.password)
+        self.assertIn(b"Successful login", rv.data)
+
+        password_hash = self.stored_password_hash()
+        self.assertTrue(password_hash.startswith(PASSWORD_HASH_METHOD + "$"))
+        self.assertTrue(PasswordHasher.check_password(password_hash, self.password))
+
+    def test_hashing_without_workers(self):
+        with mock.patch("POS.models.user_management.password_hasher.PASSWORD_HASHING_WORKERS", 0), \
+                mock.patch.object(PasswordHasher, "get_executor") as get_executor:
+            password_hash = PasswordHasher.hash_password(self.password)
+
+            self.assertTrue(PasswordHasher.check_password(password_hash, self.password))
+            self.assertFalse(PasswordHasher.check_password(password_hash, self.password + "wrong"))
+
+        get_executor.assert_not_called()
+
+    def test_busy_hasher_asks_to_retry(self):
+        with mock.patch.object(PasswordHasher, "run", side_effect=PasswordHashingBusy("Queue is full")):
+            rv = self.login(self.email, self.password)
+
+        self.assertEqual(rv.status_code, 503)
+        self.assertIn("Retry-After", rv.headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
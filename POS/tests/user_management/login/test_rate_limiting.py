@@ -0,0 +1,102 @@
+import unittest
+from unittest import mock
+
+from redis import RedisError
+from sqlalchemy import event
+
+from POS.models.base_model import AppDB
+from POS.models.rate_limiter import RateLimiter
+from POS.models.user_management.password_hasher import PasswordHasher
+from POS.models.user_management.user import User
+
+from POS.tests.base.base_test_case import BaseTestCase
+
+
+class TestRateLimiting(BaseTestCase):
+    def setUp(self):
+        self.init_test_app()
+
+        from POS import app
+        self.app = app
+        self.default_rate_limits = app.config["RATE_LIMITS"]
+
+        # Tests run with rate limiting off, enable it with a small login bucket
+        app.config["RATE_LIMITING_ENABLED"] = True
+        app.config["RATE_LIMITS"] = dict(
+            self.default_rate_limits,
+            login=dict(capacity=2, refill_per_second=0.001)
+        )
+
+        self.email = "lipaless@gmail.com"
+        self.password = "lipaless_pw"
+
+        AppDB.db_session.add(User(
+            name="lipaless",
+            email=self.email,
+            password=self.password
+        ))
+        AppDB.db_session.commit()
+
+    def tearDown(self):
+        self.app.config["RATE_LIMITING_ENABLED"] = False
+        self.app.config["RATE_LIMITS"] = self.default_rate_limits
+        super(TestRateLimiting, self).tearDown()
+
+    def count_statements(self):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = AppDB.BaseModel.metadata.bind
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        self.addCleanup(event.remove, engine, "before_cursor_execute", before_cursor_execute)
+
+        return statements
+
+    def test_over_limit_is_rejected_before_any_work(self):
+        for _ in range(2):
+            rv = self.login(self.email, self.password + "wrong")
+            self.assertIn(b"Wrong password", rv.data)
+
+        statements = self.count_statements()
+        with mock.patch.object(PasswordHasher, "check_password") as check_password:
+            rv = self.login(self.email, self.password)
+
+        self.assertEqual(rv.status_code, 429)
+        self.assertEqual(rv.headers["code"], "429")
+        self.assertGreaterEqual(int(rv.headers["Retry-After"]), 1)
+        self.assertEqual(statements, [])
+        check_password.assert_not_called()
+
+        stats = RateLimiter.stats(["login"])["login"]
+        self.assertEqual(stats, dict(allowed=2, rejected=1))
+
+    def test_buckets_are_consumed_atomically(self):
+        def consume(ip, email):
+            allowed, _ = RateLimiter.consume(
+                scope="test",
+                identities=dict(ip=ip, email=email),
+                capacity=1,
+                refill_per_second=0.001
+            )
+            return allowed
+
+        self.assertTrue(consume("10.0.0.1", "a@gmail.com"))
+
+        # The email bucket is empty, so the token of the new IP must not be taken either
+        self.assertFalse(consume("10.0.0.2", "a@gmail.com"))
+        self.assertTrue(consume("10.0.0.2", "b@gmail.com"))
+
+        self.assertEqual(RateLimiter.stats(["test"])["test"], dict(allowed=2, rejected=1))
+
+    def test_limiter_fails_open(self):
+        with mock.patch.object(RateLimiter, "consume", side_effect=RedisError("Redis is down")):
+            rv = self.login(self.email, self.password)
+
+        self.assertEqual(rv.status_code, 200)
+        self.assertIn(b"Successful login", rv.data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from POS.models.base_model import AppDB
+from POS.models.redis_store import AppRedis
+from POS.models.user_management.user import User, UserPrincipal
+
+from POS.tests.base.base_test_case import BaseTestCase
+
+
+class TestUserLoader(BaseTestCase):
+    def setUp(self):
+        self.init_test_app()
+
+        self.signup(
+            name="lipaless guy",
+            email="lipaless_guy@gmail.com",
+            password="lipaless_pw"
+        )
+        self.user = AppDB.db_session.query(User).filter(
+            User.email == "lipaless_guy@gmail.com"
+        ).first()
+
+    def test_principal_is_cached(self):
+        # An authenticated request loads the principal through the user loader
+        rv = self.test_app.get("/business")
+        self.assertIn("200", rv.status)
+
+        self.assertTrue(AppRedis.get_client().exists(UserPrincipal.cache_key(self.user.emp_id)))
+
+        principal = UserPrincipal.load(self.user.emp_id)
+        self.assertEqual(principal.get_id(), self.user.get_id())
+        self.assertEqual(principal.get_id(), str(self.user.emp_id))
+        self.assertEqual(principal.email, self.user.email)
+        self.assertFalse(hasattr(principal, "password"))
+
+    def test_principal_is_invalidated(self):
+        UserPrincipal.load(self.user.emp_id)
+
+        UserPrincipal.invalidate(self.user.emp_id)
+
+        self.assertFalse(AppRedis.get_client().exists(UserPrincipal.cache_key(self.user.emp_id)))
+
+    def test_unknown_user(self):
+        self.assertIsNone(UserPrincipal.load(self.user.emp_id + 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
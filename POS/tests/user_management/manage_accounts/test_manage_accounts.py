@@ -10,19 +10,7 @@ from POS.tests.base.base_test_case import BaseTestCase
 
 class TestManageAccounts(BaseTestCase):
     def setUp(self):
-        TestManageAccounts.confirm_app_in_testing_mode()
-
-        from POS import app
-        app.testing = True
-        app.config["JSONIFY_PRETTYPRINT_REGULAR"] = False
-        self.test_app = app.test_client()
-
-        AppDB.db_session.commit()
-        AppDB.BaseModel.metadata.drop_all()
-        AppDB.BaseModel.metadata.create_all()
-
-        from POS.models.user_management.role import Role
-        AppDB.load_default_roles(Role)
+        self.init_test_app()
 
         # Add at least 2 users (one being the owner of a business)
 
@@ -66,10 +54,6 @@ class TestManageAccounts(BaseTestCase):
         # logout as owner
         self.logout()
 
-    def tearDown(self):
-        AppDB.db_session.commit()
-        AppDB.BaseModel.metadata.drop_all()
-
     def test_add_role(self):
         # Login as owner
         self.login(self.owner_email, self.owner_password)
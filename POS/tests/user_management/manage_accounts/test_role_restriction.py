@@ -1,6 +1,5 @@
 import unittest
 
-from POS.models.base_model import AppDB
 from POS.tests.base.base_test_case import BaseTestCase
 from POS.utils import is_cashier, is_admin, is_owner
 
@@ -9,25 +8,11 @@ from POS import app
 
 class TestManageAccounts(BaseTestCase):
     def setUp(self):
-        TestManageAccounts.confirm_app_in_testing_mode()
-        app.testing = True
-        app.config["JSONIFY_PRETTYPRINT_REGULAR"] = False
-        self.test_app = app.test_client()
-
-        AppDB.db_session.commit()
-        AppDB.BaseModel.metadata.drop_all()
-        AppDB.BaseModel.metadata.create_all()
-
-        from POS.models.user_management.role import Role
-        AppDB.load_default_roles(Role)
+        self.init_test_app()
 
         # Create 3 users: owner, admin, cashier
         self.create_users()
 
-    def tearDown(self):
-        AppDB.db_session.commit()
-        AppDB.BaseModel.metadata.drop_all()
-
     def test_cashier_restriction(self):
         """
             Test if cashier decorator function truly restricts
@@ -1,10 +1,12 @@
 import os
 
-from flask import session, redirect, url_for
+from flask import session, redirect, url_for, request, current_app, make_response, jsonify
 from flask_login import current_user
+from redis import RedisError
 
 from POS import constants
 from POS.models.base_model import AppDB
+from POS.models.rate_limiter import RateLimiter
 from POS.models.billing.ewallet import EWallet
 from POS.models.user_management.user_business import UserBusiness
 from POS.models.user_management.role import Role
@@ -31,6 +33,19 @@ def selected_business(business_dependent_func):
     return wrapper
 
 
+def has_business_role(*role_names):
+    """
+        Checks with a single query if the current user holds one of the roles in the selected business
+    :param role_names: Names of the accepted roles
+    :return: bool
+    """
+    return AppDB.db_session.query(UserBusiness.emp_id).join(Role).filter(
+        UserBusiness.emp_id == current_user.emp_id,
+        UserBusiness.business_id == session.get("business_id"),
+        Role.name.in_(role_names)
+    ).first() is not None
+
+
 def is_owner(owner_restricted_func):
     """
     Decorator func to check if the user is the owner before executing a function
@@ -41,18 +56,7 @@ def is_owner(owner_restricted_func):
     @selected_business
     def wrapper():
         # Check if current user os an owner of the current business
-        # First get the owner role id
-        owner_role = AppDB.db_session.query(Role).filter(
-            Role.name == OWNER_ROLE_NAME
-        ).first()
-
-        owner = AppDB.db_session.query(UserBusiness).get((
-            current_user.emp_id,
-            session.get("business_id"),
-            owner_role.id)
-        )
-
-        if not owner:
+        if not has_business_role(OWNER_ROLE_NAME):
             return redirect(
                 location=url_for("business_bp.business"),
                 code=303
@@ -76,29 +80,7 @@ def is_admin(admin_restricted_func):
         # N/B: I know that the above statement looks like inheritance but
         # the roles themselves are not purely associated with a User
         # rather it's an attribute of the User and the Business so inheritance concept is not being applied
-
-        # First get the admin role
-        admin_role = AppDB.db_session.query(Role).filter(
-            Role.name == ADMIN_ROLE_NAME
-        ).first()
-
-        admin = AppDB.db_session.query(UserBusiness).get((
-            current_user.emp_id,
-            session.get("business_id"),
-            admin_role.id)
-        )
-
-        owner_role = AppDB.db_session.query(Role).filter(
-            Role.name == OWNER_ROLE_NAME
-        ).first()
-
-        owner = AppDB.db_session.query(UserBusiness).get((
-            current_user.emp_id,
-            session.get("business_id"),
-            owner_role.id)
-        )
-
-        if not admin and not owner:
+        if not has_business_role(ADMIN_ROLE_NAME, OWNER_ROLE_NAME):
             return redirect(
                 location=url_for("business_bp.business"),
                 code=303
@@ -117,46 +99,9 @@ def is_cashier(cashier_restricted_func):
 
     @selected_business
     def wrapper():
-        # Check if current user is an admin or owner of the current business
-        # (since what an admin can do, an owner can as well)
-        # N/B: I know that the above statement looks like inheritance but
-        # the roles themselves are not purely associated with a User
-        # rather it's an attribute of the User and the Business so inheritance concept is not being applied
-
-        # First get the owner role
-        owner_role = AppDB.db_session.query(Role).filter(
-            Role.name == OWNER_ROLE_NAME
-        ).first()
-
-        owner = AppDB.db_session.query(UserBusiness).get((
-            current_user.emp_id,
-            session.get("business_id"),
-            owner_role.id)
-        )
-
-        # Then the admin role
-        admin_role = AppDB.db_session.query(Role).filter(
-            Role.name == ADMIN_ROLE_NAME
-        ).first()
-
-        admin = AppDB.db_session.query(UserBusiness).get((
-            current_user.emp_id,
-            session.get("business_id"),
-            admin_role.id)
-        )
-
-        # Then the cashier role
-        cashier_role = AppDB.db_session.query(Role).filter(
-            Role.name == CASHIER_ROLE_NAME
-        ).first()
-
-        cashier = AppDB.db_session.query(UserBusiness).get((
-            current_user.emp_id,
-            session.get("business_id"),
-            cashier_role.id)
-        )
-
-        if not admin and not owner and not cashier:
+        # Check if current user is a cashier, admin or owner of the current business
+        # (since what a cashier can do, an admin and an owner can as well)
+        if not has_business_role(CASHIER_ROLE_NAME, ADMIN_ROLE_NAME, OWNER_ROLE_NAME):
             return redirect(
                 location=url_for("business_bp.business"),
                 code=303
@@ -181,3 +126,57 @@ def business_is_active(business_func):
                 code=303
             )
     return wrapper
+
+
+def rate_limited(scope, request_fields=("email",), per_ip=True):
+    """
+        Decorator factory that throttles a view with the token buckets configured in RATE_LIMITS[scope].
+        A token is taken from the bucket of the client IP (when per_ip) and of each of the
+        request_fields present in the JSON request, so over-limit requests are rejected
+        before touching the database
+    :param scope: Key in the RATE_LIMITS config e.g. "login"
+    :param request_fields: JSON request fields identifying the client e.g. ("email",)
+    :param per_ip: Whether to also limit by client IP
+    :return:
+    """
+    def decorator(limited_func):
+        def wrapper(*args, **kwargs):
+            if not current_app.config.get("RATE_LIMITING_ENABLED"):
+                return limited_func(*args, **kwargs)
+
+            # The app runs behind a proxy, remote_addr is fixed by ProxyFix (see PROXY_COUNT)
+            identities = dict(ip=request.remote_addr) if per_ip else dict()
+
+            limited_request = request.get_json(force=True, silent=True)
+            if isinstance(limited_request, dict):
+                for field in request_fields:
+                    if limited_request.get(field) not in ("", None):
+                        identities[field] = str(limited_request[field]).strip().lower()
+
+            if not identities:
+                return limited_func(*args, **kwargs)
+
+            try:
+                allowed, retry_after = RateLimiter.consume(
+                    scope=scope,
+                    identities=identities,
+                    **current_app.config["RATE_LIMITS"][scope]
+                )
+            except RedisError as e:
+                # Do not lock everyone out when the limiter itself is unavailable
+                current_app.logger.error(e)
+                return limited_func(*args, **kwargs)
+
+            if not allowed:
+                current_app.logger.warning("Rate limit (%s) exceeded by %s" % (scope, identities))
+                response = make_response(
+                    jsonify(dict(msg="Too many requests, try again later")),
+                    429
+                )
+                response.headers["code"] = 429
+                response.headers["Retry-After"] = str(int(retry_after) + 1)
+                return response
+
+            return limited_func(*args, **kwargs)
+        return wrapper
+    return decorator
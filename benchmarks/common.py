@@ -0,0 +1,88 @@
+"""
+    Helpers shared by the benchmark scripts: a cookie keeping JSON HTTP client
+    (for benchmarks driving a running server) and latency summaries
+"""
+
+import http.cookiejar
+import json
+import time
+import urllib.error
+import urllib.request
+
+
+class HttpClient(object):
+    """
+        Minimal HTTP client keeping its own cookies, i.e. one logged in user of the app
+    """
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()),
+            NoRedirectHandler()
+        )
+
+    def request(self, method, endpoint, payload=None):
+        """
+            Sends a request and times it
+        :return: (status code, response body, seconds taken)
+        """
+        data = None
+        headers = {}
+        if payload is not None:
+            data = json.dumps(payload).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+
+        http_request = urllib.request.Request(self.base_url + endpoint, data=data, headers=headers, method=method)
+
+        start = time.perf_counter()
+        try:
+            with self.opener.open(http_request, timeout=self.timeout) as response:
+                body = response.read()
+                status = response.status
+        except urllib.error.HTTPError as error:
+            body = error.read()
+            status = error.code
+        return status, body, time.perf_counter() - start
+
+    def get(self, endpoint):
+        return self.request("GET", endpoint)
+
+    def post(self, endpoint, payload):
+        return self.request("POST", endpoint, payload)
+
+
+class NoRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """
+        The app answers with 303 redirects (e.g. after selecting a business),
+        keep them as responses instead of following them so only one request is timed
+    """
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summarize_latencies(seconds, elapsed=None):
+    """
+        Summarizes request latencies in milliseconds
+    :param seconds: List of request durations in seconds
+    :param elapsed: Wall time over which the requests ran, to compute the throughput
+    :return: dict
+    """
+    if not seconds:
+        return dict(count=0)
+
+    summary = dict(
+        count=len(seconds),
+        p50_ms=round(percentile(seconds, 0.50) * 1000, 2),
+        p95_ms=round(percentile(seconds, 0.95) * 1000, 2),
+        p99_ms=round(percentile(seconds, 0.99) * 1000, 2),
+        max_ms=round(max(seconds) * 1000, 2)
+    )
+    if elapsed:
+        summary["requests_per_second"] = round(len(seconds) / elapsed, 2)
+    return summary
@@ -0,0 +1,158 @@
+"""
+    Shows the query plans of the hot lookups before and after the indexes of migration 0002.
+    Seeds a scratch schema at the initial revision (the schema without the indexes) with a large dataset,
+    runs EXPLAIN ANALYZE on every lookup, migrates the schema to the latest revision and explains them again.
+    Prints the plans and execution times of each lookup as JSON, then drops the schema.
+
+    It needs the Postgres database of the testing configuration, e.g.
+        LipaLess_CONFIG=testing python -m benchmarks.index_plans --sales 1000000
+"""
+
+import argparse
+import json
+import statistics
+
+from sqlalchemy import create_engine, text
+
+from POS.tests.base.base_test_case import BaseTestCase
+
+SCHEMA = "bench_index_plans"
+
+# The lookups of the request paths, on the columns indexed by migration 0002
+LOOKUPS = dict(
+    products_of_business="SELECT * FROM product WHERE business_id = :business_id",
+    categories_of_business="SELECT * FROM category WHERE business_id = :business_id",
+    ewallet_of_business="SELECT * FROM ewallet WHERE business_id = :business_id",
+    users_of_business="SELECT * FROM user_business WHERE business_id = :business_id",
+    sales_of_business_day="SELECT * FROM sales_transaction WHERE business_id = :business_id "
+                          "AND timestamp >= :day AND timestamp < CAST(:day AS timestamp) + interval '1 day'",
+    line_items_of_sale="SELECT * FROM line_item WHERE sales_transaction_id = :sales_transaction_id",
+    billing_of_account="SELECT * FROM billing_transaction WHERE account_id = :account_id"
+)
+
+# Seeds the tables with generate_series, the sales spread over the year before 2026-01-01
+SEED_STATEMENTS = [
+    "INSERT INTO business (id, name, contact_number) "
+    "SELECT n, 'business ' || n, '0700000000' FROM generate_series(1, :businesses) n",
+    "INSERT INTO lipalessuser (emp_id, name, email, password) "
+    "SELECT n, 'clerk ' || n, 'clerk_' || n || '@example.com', 'x' FROM generate_series(1, :businesses) n",
+    "INSERT INTO role (id, name, description) VALUES (1, 'cashier', 'bench')",
+    "INSERT INTO user_business (emp_id, business_id, role_id, is_deactivated) "
+    "SELECT n, n, 1, false FROM generate_series(1, :businesses) n",
+    "INSERT INTO ewallet (account_id, balance, business_id) SELECT n, 1000, n FROM generate_series(1, :businesses) n",
+    "INSERT INTO category (id, name, business_id) "
+    "SELECT n, 'category ' || n, 1 + n % :businesses FROM generate_series(1, :businesses * 5) n",
+    "INSERT INTO product (id, name, buying_price, selling_price, reorder_level, quantity, business_id, category_id) "
+    "SELECT n, 'product ' || n, 50, 80, 10, 1000, 1 + n % :businesses, 1 + n % (:businesses * 5) "
+    "FROM generate_series(1, :businesses * :products) n",
+    "INSERT INTO sales_transaction (id, timestamp, amount_given, cashier_id, business_id) "
+    "SELECT n, timestamp '2025-01-01' + (n % 31536000) * interval '1 second', 100, 1 + n % :businesses, "
+    "1 + n % :businesses FROM generate_series(1, :sales) n",
+    "INSERT INTO line_item (id, name, price, quantity, product_id, sales_transaction_id) "
+    "SELECT n, 'product', 80, 1, 1 + n % (:businesses * :products), n FROM generate_series(1, :sales) n",
+    "INSERT INTO billing_transaction (transaction_id, timestamp, amount, account_id) "
+    "SELECT n, timestamp '2025-01-01' + n * interval '1 minute', 5, 1 + n % :businesses "
+    "FROM generate_series(1, :sales / 10) n"
+]
+
+
+def describe_plan(plan):
+    """
+        Lists the nodes of a plan, with the index used by the index scans
+    :param plan: Plan of EXPLAIN (FORMAT JSON)
+    :return: list of str
+    """
+    node = plan["Node Type"]
+    if "Index Name" in plan:
+        node += " using " + plan["Index Name"]
+    return [node] + [child for sub_plan in plan.get("Plans", []) for child in describe_plan(sub_plan)]
+
+
+def explain(connection, statement, parameters, repeat):
+    """
+        Runs EXPLAIN ANALYZE of the statement repeat times
+    :return: dict with the plan nodes, the estimated cost and the median execution time
+    """
+    execution_ms = []
+    for _ in range(repeat):
+        result = connection.execute(text("EXPLAIN (ANALYZE, FORMAT JSON) " + statement), parameters).scalar()
+        execution_ms.append(result[0]["Execution Time"])
+
+    plan = result[0]["Plan"]
+    return dict(
+        plan=describe_plan(plan),
+        total_cost=plan["Total Cost"],
+        execution_ms=round(statistics.median(execution_ms), 3)
+    )
+
+
+def explain_lookups(engine, parameters, repeat):
+    with engine.connect() as connection:
+        connection.execute("ANALYZE")
+        return {
+            name: explain(connection, statement, parameters, repeat)
+            for name, statement in LOOKUPS.items()
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sales", type=int, default=1000000, help="Sales transactions and line items to seed")
+    parser.add_argument("--businesses", type=int, default=1000, help="Businesses to seed")
+    parser.add_argument("--products", type=int, default=50, help="Products per business")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs of each lookup, the median time is reported")
+    args = parser.parse_args()
+
+    BaseTestCase.confirm_app_in_testing_mode()
+
+    from POS import app
+    from POS.migrations import AppMigrations, INITIAL_REVISION
+    from POS.models.base_model import AppDB
+
+    AppDB.db_engine.execute('DROP SCHEMA IF EXISTS "%s" CASCADE' % SCHEMA)
+    AppDB.db_engine.execute('CREATE SCHEMA "%s"' % SCHEMA)
+    engine = create_engine(
+        app.config["SQLALCHEMY_DATABASE_URI"],
+        connect_args=dict(options="-csearch_path=%s" % SCHEMA)
+    )
+
+    try:
+        AppMigrations.upgrade(engine, INITIAL_REVISION)
+
+        with engine.begin() as connection:
+            for statement in SEED_STATEMENTS:
+                connection.execute(text(statement), businesses=args.businesses, products=args.products,
+                                   sales=args.sales)
+
+        # Look up a business in the middle of the data, on a day of its sales
+        parameters = dict(
+            business_id=args.businesses // 2,
+            day="2025-06-15",
+            sales_transaction_id=args.sales // 2,
+            account_id=args.businesses // 2
+        )
+
+        before = explain_lookups(engine, parameters, args.repeat)
+        AppMigrations.upgrade(engine)
+        after = explain_lookups(engine, parameters, args.repeat)
+    finally:
+        engine.dispose()
+        AppDB.db_engine.execute('DROP SCHEMA IF EXISTS "%s" CASCADE' % SCHEMA)
+
+    print(json.dumps(dict(
+        sales=args.sales,
+        businesses=args.businesses,
+        products=args.businesses * args.products,
+        lookups={
+            name: dict(
+                before=before[name],
+                after=after[name],
+                speedup=round(before[name]["execution_ms"] / max(after[name]["execution_ms"], 0.001), 1)
+            )
+            for name in LOOKUPS
+        }
+    ), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+    Load tests the cashier workflow of a running server: every clerk logs in, selects their business
+    and then repeatedly lists the products (GET /products) and checks out a cart (POST /sales),
+    all clerks at the same time. Prints the latency percentiles and throughput of each endpoint as JSON.
+
+    The businesses, clerks and products are seeded straight into the database the server uses, so run
+    both with the same (testing) configuration, which also turns rate limiting off. Start the app, e.g.
+        LipaLess_CONFIG=testing gunicorn -w 4 -b 127.0.0.1:8000 run:app
+    then run
+        LipaLess_CONFIG=testing python -m benchmarks.load_test --base-url http://127.0.0.1:8000 \\
+            --businesses 5 --clerks 4 --products 200 --iterations 50
+
+    GET /products is restricted to admins, so the clerks are seeded as admins (who can also sell)
+"""
+
+import argparse
+import collections
+import json
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import HttpClient, summarize_latencies
+from POS.tests.base.base_test_case import BaseTestCase
+
+CLERK_PASSWORD = "bench_pw"
+SEEDED_BALANCE = 10 ** 9
+SEEDED_QUANTITY = 10 ** 7
+
+# Selecting a business redirects to the dashboard, other redirects mean the request was refused
+EXPECTED_STATUS = {"GET /business/select": 302}
+
+
+def seed(businesses, clerks_per_business, products_per_business):
+    """
+        Creates the businesses with their e-wallet, clerks and products
+    :return: list of dicts with the email and business_id of each clerk
+    """
+    from POS import app
+    from POS.constants import ADMIN_ROLE_NAME
+    from POS.models.base_model import AppDB
+    from POS.models.billing.ewallet import EWallet
+    from POS.models.stock_management.product import Product
+    from POS.models.user_management.business import Business
+    from POS.models.user_management.role import Role
+    from POS.models.user_management.user import User
+    from POS.models.user_management.user_business import UserBusiness
+
+    tag = uuid.uuid4().hex[:8]
+    clerks = []
+
+    with app.app_context():
+        admin_role_id = Role.get_role_id(ADMIN_ROLE_NAME)
+
+        for business_num in range(businesses):
+            business = Business(name="bench %s %d" % (tag, business_num), contact_no="0700000000")
+
+            # Enough credit for the billing jobs not to lock the clerks out during the test
+            ewallet = EWallet(balance=SEEDED_BALANCE)
+            ewallet.business = business
+            AppDB.db_session.add(business)
+
+            for product_num in range(products_per_business):
+                product = Product(
+                    name="bench product %d" % product_num,
+                    description=None,
+                    buying_price=50,
+                    selling_price=random.randint(60, 500),
+                    reorder_level=10,
+                    quantity=SEEDED_QUANTITY
+                )
+                product.business = business
+                AppDB.db_session.add(product)
+
+            business_clerks = []
+            for clerk_num in range(clerks_per_business):
+                email = "bench_%s_%d_%d@example.com" % (tag, business_num, clerk_num)
+                user = User(name="bench clerk %d %d" % (business_num, clerk_num), email=email, password=CLERK_PASSWORD)
+
+                user_business = UserBusiness(admin_role_id)
+                user_business.business = business
+                user_business.user = user
+                AppDB.db_session.add(user)
+                business_clerks.append(email)
+
+            AppDB.db_session.commit()
+
+            products = [dict(id=product.id, name=product.name, selling_price=product.selling_price)
+                        for product in business.products]
+            clerks.extend(
+                dict(email=email, business_id=business.id, products=products) for email in business_clerks
+            )
+
+    return clerks
+
+
+def random_cart(products, cart_size, rng):
+    line_items = [
+        dict(product_id=product["id"], name=product["name"], selling_price=product["selling_price"],
+             quantity=rng.randint(1, 3))
+        for product in rng.sample(products, min(cart_size, len(products)))
+    ]
+    total = sum(line_item["selling_price"] * line_item["quantity"] for line_item in line_items)
+    return dict(transaction=dict(amount_given=total), line_items=line_items)
+
+
+def run_clerk(base_url, clerk, iterations, cart_size, seed_value):
+    """
+        Runs the workflow of one clerk
+    :return: list of (endpoint, succeeded, seconds)
+    """
+    rng = random.Random(seed_value)
+    client = HttpClient(base_url)
+    results = []
+
+    def timed(endpoint, response):
+        status, _, seconds = response
+        results.append((endpoint, status == EXPECTED_STATUS.get(endpoint, 200), seconds))
+
+    timed("POST /login", client.post("/login", dict(email=clerk["email"], password=CLERK_PASSWORD)))
+    timed("GET /business/select", client.get("/business/select/%s" % clerk["business_id"]))
+
+    for _ in range(iterations):
+        timed("GET /products", client.get("/products"))
+        timed("POST /sales", client.post("/sales", random_cart(clerk["products"], cart_size, rng)))
+
+    client.get("/logout")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:5000")
+    parser.add_argument("--businesses", type=int, default=5, help="Businesses to seed")
+    parser.add_argument("--clerks", type=int, default=4, help="Concurrent clerks per business")
+    parser.add_argument("--products", type=int, default=200, help="Products per business")
+    parser.add_argument("--iterations", type=int, default=50, help="Product listings and checkouts per clerk")
+    parser.add_argument("--cart-size", type=int, default=5, help="Line items per checkout")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random carts, for reproducible runs")
+    args = parser.parse_args()
+
+    BaseTestCase.confirm_app_in_testing_mode()
+
+    random.seed(args.seed)
+    clerks = seed(args.businesses, args.clerks, args.products)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(clerks)) as executor:
+        clerk_results = list(executor.map(
+            lambda numbered_clerk: run_clerk(
+                args.base_url, numbered_clerk[1], args.iterations, args.cart_size, args.seed + numbered_clerk[0]
+            ),
+            enumerate(clerks)
+        ))
+    elapsed = time.perf_counter() - start
+
+    durations = collections.defaultdict(list)
+    failures = collections.Counter()
+    for endpoint, succeeded, seconds in (result for results in clerk_results for result in results):
+        durations[endpoint].append(seconds)
+        if not succeeded:
+            failures[endpoint] += 1
+
+    print(json.dumps(dict(
+        businesses=args.businesses,
+        clerks=len(clerks),
+        products_per_business=args.products,
+        iterations_per_clerk=args.iterations,
+        cart_size=args.cart_size,
+        elapsed_seconds=round(elapsed, 2),
+        endpoints={
+            endpoint: dict(failures=failures[endpoint], **summarize_latencies(seconds, elapsed))
+            for endpoint, seconds in durations.items()
+        }
+    ), indent=2))
+
+
+if __name__ == "__main__":
+    main()
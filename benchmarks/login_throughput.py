@@ -0,0 +1,94 @@
+"""
+    Measures the login throughput of a running server under concurrent load.
+    While the logins run, a probe keeps requesting a cheap page to show whether
+    password hashing stalls the other requests handled by the same workers.
+
+    It signs up throwaway users on the server it targets. Start the app, e.g.
+        gunicorn -w 4 -b 127.0.0.1:8000 run:app
+    then run
+        python -m benchmarks.login_throughput --base-url http://127.0.0.1:8000 --users 20 --logins 10
+"""
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import HttpClient, summarize_latencies
+
+PROBE_ENDPOINT = "/login"
+
+
+def sign_up_users(base_url, count):
+    tag = uuid.uuid4().hex[:8]
+    users = [
+        dict(name="bench %s %d" % (tag, num), email="bench_%s_%d@example.com" % (tag, num), password="bench_pw")
+        for num in range(count)
+    ]
+
+    for user in users:
+        client = HttpClient(base_url)
+        client.post("/signup", user)
+        client.get("/logout")
+
+    return users
+
+
+def log_in_repeatedly(base_url, user, logins):
+    client = HttpClient(base_url)
+    durations, failures = [], 0
+
+    for _ in range(logins):
+        status, body, seconds = client.post("/login", dict(email=user["email"], password=user["password"]))
+        if status != 200 or b"Successful login" not in body:
+            failures += 1
+        durations.append(seconds)
+        client.get("/logout")
+
+    return durations, failures
+
+
+def probe(base_url, stop_event, durations):
+    client = HttpClient(base_url)
+    while not stop_event.is_set():
+        durations.append(client.get(PROBE_ENDPOINT)[2])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:5000")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent users logging in")
+    parser.add_argument("--logins", type=int, default=10, help="Logins per user")
+    args = parser.parse_args()
+
+    users = sign_up_users(args.base_url, args.users)
+
+    stop_event = threading.Event()
+    probe_durations = []
+    probe_thread = threading.Thread(target=probe, args=(args.base_url, stop_event, probe_durations))
+    probe_thread.start()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as executor:
+        results = list(executor.map(lambda user: log_in_repeatedly(args.base_url, user, args.logins), users))
+    elapsed = time.perf_counter() - start
+
+    stop_event.set()
+    probe_thread.join()
+
+    login_durations = [seconds for durations, _ in results for seconds in durations]
+
+    print(json.dumps(dict(
+        users=args.users,
+        logins_per_user=args.logins,
+        elapsed_seconds=round(elapsed, 2),
+        failed_logins=sum(failures for _, failures in results),
+        login=summarize_latencies(login_durations, elapsed),
+        probe=dict(endpoint=PROBE_ENDPOINT, **summarize_latencies(probe_durations, elapsed))
+    ), indent=2))
+
+
+if __name__ == "__main__":
+    main()
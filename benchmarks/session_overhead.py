@@ -0,0 +1,162 @@
+"""
+    Measures the per-request session overhead (bytes written to Redis and time spent
+    loading/saving the session) of the dashboard and /products endpoints, comparing
+    Flask-Session's pickle based interface with the app's compact interface.
+
+    It signs up a throwaway user and business, so run it with the testing configuration:
+        LipaLess_CONFIG=testing python -m benchmarks.session_overhead --requests 500
+"""
+
+import argparse
+import json
+import statistics
+import time
+import uuid
+
+from flask_session import RedisSessionInterface
+
+from benchmarks.common import percentile
+from POS.tests.base.base_test_case import BaseTestCase
+
+ENDPOINTS = ("/dashboard", "/products")
+
+
+class CountingRedis(object):
+    """
+        Wraps a Redis client to count the writes issued by a session interface
+    """
+    def __init__(self, client):
+        self.client = client
+        self.writes = 0
+        self.bytes_written = 0
+
+    def setex(self, name, time, value):
+        self.writes += 1
+        self.bytes_written += len(value)
+        return self.client.setex(name=name, time=time, value=value)
+
+    def expire(self, name, time):
+        self.writes += 1
+        return self.client.expire(name, time)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+class MeasuredSessionInterface(object):
+    """
+        Wraps a session interface to time open_session/save_session
+    """
+    def __init__(self, interface):
+        self.interface = interface
+        self.redis = CountingRedis(interface.redis)
+        interface.redis = self.redis
+        self.reset()
+
+    def reset(self):
+        self.redis.writes = 0
+        self.redis.bytes_written = 0
+        self.open_seconds = []
+        self.save_seconds = []
+        self.payload_bytes = []
+
+    def open_session(self, app, request):
+        start = time.perf_counter()
+        session = self.interface.open_session(app, request)
+        self.open_seconds.append(time.perf_counter() - start)
+        return session
+
+    def save_session(self, app, session, response):
+        self.payload_bytes.append(len(self.interface.serializer.dumps(dict(session))))
+
+        start = time.perf_counter()
+        self.interface.save_session(app, session, response)
+        self.save_seconds.append(time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self.interface, name)
+
+
+def to_microseconds(seconds):
+    return round(seconds * 1000000, 1)
+
+
+def sign_up_with_business(test_app):
+    tag = uuid.uuid4().hex[:8]
+
+    test_app.post("/signup", content_type="application/json", data=json.dumps(dict(
+        name="bench %s" % tag,
+        email="bench_%s@example.com" % tag,
+        password="bench_pw"
+    )))
+    test_app.post("/business", content_type="application/json", data=json.dumps(dict(
+        name="bench business %s" % tag,
+        contact_number="0700000000"
+    )))
+
+
+def measure(app, interface, requests_per_endpoint):
+    measured_interface = MeasuredSessionInterface(interface)
+    app.session_interface = measured_interface
+
+    test_app = app.test_client()
+    sign_up_with_business(test_app)
+
+    results = {}
+    for endpoint in ENDPOINTS:
+        measured_interface.reset()
+
+        for _ in range(requests_per_endpoint):
+            test_app.get(endpoint)
+
+        session_seconds = [
+            open_time + save_time
+            for open_time, save_time in zip(measured_interface.open_seconds, measured_interface.save_seconds)
+        ]
+
+        results[endpoint] = dict(
+            payload_bytes=statistics.median(measured_interface.payload_bytes),
+            redis_writes_per_request=measured_interface.redis.writes / requests_per_endpoint,
+            redis_bytes_written_per_request=measured_interface.redis.bytes_written / requests_per_endpoint,
+            open_us_median=to_microseconds(statistics.median(measured_interface.open_seconds)),
+            save_us_median=to_microseconds(statistics.median(measured_interface.save_seconds)),
+            session_us_p95=to_microseconds(percentile(session_seconds, 0.95))
+        )
+
+    test_app.get("/logout")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint and interface")
+    args = parser.parse_args()
+
+    BaseTestCase.confirm_app_in_testing_mode()
+
+    from POS import app
+    from POS.sessions import CompactRedisSessionInterface
+
+    default_interface = app.session_interface
+    interfaces = dict(
+        pickle=RedisSessionInterface(
+            app.config["SESSION_REDIS"], app.config["SESSION_KEY_PREFIX"], permanent=app.config["SESSION_PERMANENT"]
+        ),
+        compact=CompactRedisSessionInterface(
+            app.config["SESSION_REDIS"], app.config["SESSION_KEY_PREFIX"], permanent=app.config["SESSION_PERMANENT"]
+        )
+    )
+
+    try:
+        report = {
+            name: measure(app, interface, args.requests)
+            for name, interface in interfaces.items()
+        }
+    finally:
+        app.session_interface = default_interface
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
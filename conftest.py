@@ -0,0 +1,24 @@
+"""
+    pytest configuration. When the tests run in parallel worker processes (pytest -n 4, with pytest-xdist),
+    every worker keeps its tables in its own Postgres schema and its data in its own Redis database,
+    so that the workers don't see each other's data.
+    This runs before the app is imported, which is why the environment variable names are spelled out
+"""
+
+import os
+from urllib.parse import urlsplit, urlunsplit
+
+# Redis databases 1 to 15, database 0 is left to the tests run without workers
+MAX_WORKERS = 15
+
+worker = os.environ.get("PYTEST_XDIST_WORKER")
+
+if worker:
+    worker_num = int(worker.lstrip("gw"))
+    if worker_num >= MAX_WORKERS:
+        raise RuntimeError("The tests can run in at most %d workers" % MAX_WORKERS)
+
+    os.environ["LipaLess_TEST_DATABASE_SCHEMA"] = "test_%s" % worker
+
+    redis_url = urlsplit(os.environ.get("REDISCLOUD_URL", "redis://127.0.0.1:6379"))
+    os.environ["REDISCLOUD_URL"] = urlunsplit(redis_url._replace(path="/%d" % (worker_num + 1)))
@@ -1,10 +1,15 @@
 import os
 
 from POS import app
+from POS.models.base_model import AppDB
 
 # Bind to $PORT if defined, otherwise default to 5000.
 port = int(os.environ.get('PORT', 5000))
 
+# Refuse to serve a database the migrations were not run on
+with app.app_context():
+    AppDB.verify_schema()
+
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=port)
@@ -6,7 +6,7 @@ setup(
     version="1.0.0",
     description="An online pay-as-you-go Point Of Sale System",
     long_description=open("README.md").read(),
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     include_package_data=True,
     install_requires=[
         "click==6.7",